@@ -0,0 +1,49 @@
+import hmac
+import logging
+
+import streamlit as st
+
+# --- Yönetici Girişi ---
+# Geçmiş mülakat listesi, anahtarsız rapor açma ve aday sıralama paneli tüm adayların verisini gösterir.
+# Bu yüzden sunucu bayrağıyla değil, oturum başına parolayla açılır: parola .streamlit/secrets.toml içinde
+#   admin_password = "..."
+# olarak tanımlanır. Tanımlı değilse yönetici özellikleri kapalıdır. Giriş sadece o tarayıcı oturumunda geçerlidir.
+log = logging.getLogger(__name__)
+
+
+def configured_password():
+    try: password = st.secrets.get("admin_password")
+    except Exception:  # secrets.toml yok ya da okunamıyor
+        return None
+    return str(password) if password else None
+
+
+def is_admin():
+    return bool(st.session_state.get("admin_authenticated")) and configured_password() is not None
+
+
+def check_password(given):
+    password = configured_password()
+    if password is None or not given: return False
+    return hmac.compare_digest(given.encode("utf-8"), password.encode("utf-8"))
+
+
+def login_panel():
+    # Kenar çubuğunda giriş/çıkış; parola tanımlı değilse hiçbir şey çizilmez
+    if configured_password() is None: return False
+    if is_admin():
+        if st.button("🔓 Yönetici çıkışı"):
+            st.session_state.admin_authenticated = False
+            st.rerun()
+        return True
+    with st.expander("🔐 Yönetici Girişi"):
+        with st.form("admin_login", clear_on_submit=True):
+            given = st.text_input("Parola", type="password")
+            submitted = st.form_submit_button("Giriş")
+        if submitted:
+            if check_password(given):
+                st.session_state.admin_authenticated = True
+                st.rerun()
+            log.warning("Hatalı yönetici parolası denemesi")
+            st.error("Parola hatalı.")
+    return False
@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from interview_core import SAFETY_SETTINGS, Interview
+from scoring import JSON_CONFIG, AnswerScorer
+
+# --- Toplu Tarama (Streamlit'siz) ---
+# Bir klasördeki CV'leri tek bir JD ve senaryolu aday cevaplarıyla mülakattan geçirir,
+# rapor kayıtlarını bittikçe JSONL dosyasına yazar. Örnek:
+#   python batch_screen.py --cv-dir cvs/ --jd ilan.txt --answers cevaplar.json --out sonuc.jsonl --concurrency 50
+# Cevaplar uygulamadaki gibi AnswerScorer ile tek tek puanlanır; rapor metni ayrıştırılmaz.
+
+
+def load_answers(path):
+    # .json: liste (tüm adaylar için) ya da {"cv_adı": [...], "*": [...]} sözlüğü; diğerleri: satır başına bir cevap
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            data = json.load(f)
+            return data if isinstance(data, dict) else {"*": data}
+        return {"*": [line.strip() for line in f if line.strip()]}
+
+
+def load_cv_text(path):
+    if path.lower().endswith(".pdf"):
+        from pdf_extract import extract_pdf
+        return extract_pdf(path)["text"]
+    with open(path, encoding="utf-8") as f: return f.read()
+
+
+def run_interview(path, job_description, answers, make_model, scheduler, api_key, transcript=False, scoring_model=None):
+    # scoring_model: JSON çıktılı puanlama modeli; verilmezse rapor tek REPORT_PROMPT çağrısıyla alınır
+    name = os.path.basename(path)
+    record = {"cv": name}
+    t0 = time.perf_counter()
+    try:
+        scorer = AnswerScorer(scoring_model, scheduler, api_key) if scoring_model is not None else None
+        interview = Interview(make_model, job_description, load_cv_text(path), scheduler=scheduler, api_key=api_key,
+                              scorer=scorer)
+        interview.start()
+        for answer in answers.get(os.path.splitext(name)[0], answers.get("*", [])):
+            interview.answer(answer)
+        record.update(interview.finish())
+        record["turns"] = len(interview.turn_seconds)
+        if transcript: record["messages"] = interview.messages
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - t0, 3)
+    return record
+
+
+def save_record(store, record, job_description, model_name):
+    # Sıralama panelinde görünmesi için toplu tarama sonuçları da oturum deposuna tamamlanmış mülakat olarak yazılır
+    from session_store import new_session_id
+    session_id = new_session_id()
+    store.create(session_id, record["cv"], model_name, job_description, "")
+    if record.get("messages"): store.append_turns(session_id, 0, record["messages"])
+    if "score" in record: store.finish(session_id, {k: record[k] for k in ("score", "decision", "categories", "values", "text", "missing", "scored", "failed") if k in record})
+
+
+async def run_batch(paths, job_description, answers, make_model, out_path, concurrency=20,
+                    scheduler=None, api_key=None, transcript=False, store=None, model_name=None, scoring_model=None):
+    # Gemini istemcisi senkron olduğundan her mülakat bir iş parçacığında yürür;
+    # eşzamanlılık semafor ile, API kotası zamanlayıcı ile sınırlanır.
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(path):
+        async with semaphore:
+            return await asyncio.to_thread(run_interview, path, job_description, answers, make_model,
+                                           scheduler, api_key, transcript, scoring_model)
+
+    done = failed = 0
+    with open(out_path, "a", encoding="utf-8") as out:
+        for future in asyncio.as_completed([one(p) for p in paths]):
+            record = await future
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            if store is not None: save_record(store, record, job_description, model_name)
+            done += 1
+            failed += "error" in record
+            print(f"[{done}/{len(paths)}] {record['cv']} ({record['seconds']} sn)", file=sys.stderr)
+    if store is not None: store.flush(timeout=60)
+    return done, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI mülakat simülasyonu - toplu tarama")
+    parser.add_argument("--cv-dir", required=True, help="CV klasörü (.pdf veya .txt)")
+    parser.add_argument("--jd", required=True, help="İş ilanı metin dosyası")
+    parser.add_argument("--answers", required=True, help="Senaryolu aday cevapları (.json veya .txt)")
+    parser.add_argument("--out", default="batch_results.jsonl")
+    parser.add_argument("--model", default="models/gemini-1.5-flash")
+    parser.add_argument("--api-key", default=os.environ.get("GOOGLE_API_KEY"))
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rpm", type=float, default=float(os.environ.get("MULAKAT_RPM", 15)),
+                        help="API anahtarı başına dakikalık istek sınırı")
+    parser.add_argument("--transcript", action="store_true", help="Konuşma dökümünü kayda ekle")
+    parser.add_argument("--fake", action="store_true", help="Ağ yerine yerel sahte modeli kullan")
+    parser.add_argument("--store", action="store_true", help="Sonuçları oturum deposuna da yaz (aday sıralama paneli)")
+    args = parser.parse_args(argv)
+
+    paths = sorted(os.path.join(args.cv_dir, n) for n in os.listdir(args.cv_dir)
+                   if n.lower().endswith((".pdf", ".txt")))
+    with open(args.jd, encoding="utf-8") as f: job_description = f.read()
+    answers = load_answers(args.answers)
+
+    scheduler = None
+    if args.fake:
+        from fake_gemini import FakeBackend, FakeModel
+        backend = FakeBackend()
+        make_model = lambda system_instruction: FakeModel(backend, system_instruction=system_instruction)
+        scoring_model = FakeModel(backend)
+    else:
+        if not args.api_key: parser.error("--api-key veya GOOGLE_API_KEY gerekli")
+        from model_registry import get_registry
+        from scheduler import Scheduler
+        scheduler = Scheduler(requests_per_minute=args.rpm, max_concurrent=args.concurrency)
+        make_model = lambda system_instruction: get_registry().new_model(
+            args.api_key, args.model, safety_settings=SAFETY_SETTINGS, system_instruction=system_instruction)
+        scoring_model = get_registry().get_model(args.api_key, args.model, generation_config=JSON_CONFIG)
+
+    store = None
+    if args.store:
+        from session_store import get_store
+        store = get_store()
+
+    t0 = time.perf_counter()
+    done, failed = asyncio.run(run_batch(paths, job_description, answers, make_model, args.out,
+                                         concurrency=args.concurrency, scheduler=scheduler,
+                                         api_key=args.api_key, transcript=args.transcript,
+                                         store=store, model_name="fake" if args.fake else args.model,
+                                         scoring_model=scoring_model))
+    print(f"{done} mülakat tamamlandı ({failed} hatalı), {time.perf_counter() - t0:.1f} sn -> {args.out}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# --- Performans Ölçümleri ---
+# Ağ ve Streamlit gerektirmeden sıcak yolları ölçer; sonuçlar JSON olarak yazılır, --compare ile
+# önceki bir çalıştırmaya göre fark raporlanır. Örnek:
+#   python benchmarks/run_benchmarks.py --out bench.json
+#   python benchmarks/run_benchmarks.py --out yeni.json --compare bench.json
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Önbellekler geçici bir klasöre yazılsın; soğuk ölçümler önceki çalıştırmalardan etkilenmesin
+os.environ.setdefault("MULAKAT_CACHE_DIR", tempfile.mkdtemp(prefix="mulakat_bench_"))
+
+SAMPLE_REPORT = {
+    "score": 72,
+    "decision": "Olumlu",
+    "categories": ["TEKNİK", "İLETİŞİM", "PROBLEM_ÇÖZME", "TEORİK_BİLGİ", "POTANSİYEL"],
+    "values": [80, 70, 65, 75, 70],
+    "text": "Aday teknik konularda güçlü, iletişimi açık ve yapılandırılmış. " * 40,
+}
+SAMPLE_REPORT_TEXT = """SKOR: 72
+KARAR: Olumlu
+-- PUAN DETAYLARI --
+TEKNİK: 80
+İLETİŞİM: 70
+PROBLEM_ÇÖZME: 65
+TEORİK_BİLGİ: 75
+POTANSİYEL: 70
+-- SÖZEL RAPOR --
+""" + "Aday deneyimlerini somut örneklerle anlattı. " * 60
+
+
+def measure(fn, repeat=5, warmup=1):
+    for _ in range(warmup): fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return {
+        "n": repeat,
+        "mean": statistics.fmean(samples),
+        "p50": samples[len(samples) // 2],
+        "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "min": samples[0],
+    }
+
+
+def make_cv_pdf(pages, seed=""):
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.set_font("Arial", "", 11)
+    line = "Python, Django, PostgreSQL, Docker ve Kubernetes ile olceklenebilir servisler gelistirdim. "
+    for i in range(pages):
+        pdf.add_page()
+        pdf.multi_cell(0, 6, f"{seed} Sayfa {i + 1}\n" + line * 25)
+    out = pdf.output(dest="S")
+    return out.encode("latin-1") if isinstance(out, str) else bytes(out)
+
+
+def bench_pdf_extract(args):
+    from pdf_extract import extract_pdf
+    results = {}
+    for pages in (5, args.pdf_pages):
+        # Her turda farklı içerik: önbelleğe takılmayan (soğuk) çıkarma; ilki ısınmada önbelleğe girer
+        docs = [make_cv_pdf(pages, seed=f"cold-{time.time_ns()}-{i}") for i in range(args.repeat + 1)]
+        it = iter(docs)
+        results[f"pdf_extract_cold_{pages}p"] = measure(lambda: extract_pdf(next(it)), repeat=args.repeat)
+        warm = docs[0]
+        results[f"pdf_extract_cached_{pages}p"] = measure(lambda: extract_pdf(warm), repeat=args.repeat * 4)
+    return results
+
+
+def bench_pdf_report(args):
+    import report_pdf
+    use_font = "Roboto" if all(os.path.exists(os.path.join(report_pdf.FONT_DIR, n)) for n in report_pdf.FONTS) else "Arial"
+    results = {"pdf_render": measure(lambda: report_pdf.render_pdf(SAMPLE_REPORT, use_font), repeat=args.repeat * 4)}
+    report_pdf._use_font = use_font  # ağa çıkmadan ensure_fonts sonucunu sabitle
+    report_pdf.create_pdf_report(SAMPLE_REPORT)
+    results["pdf_render_memoized"] = measure(lambda: report_pdf.create_pdf_report(SAMPLE_REPORT), repeat=args.repeat * 20)
+    batch = [dict(SAMPLE_REPORT, score=i % 100) for i in range(args.batch_reports)]
+    t0 = time.perf_counter()
+    report_pdf.render_reports(batch)
+    elapsed = time.perf_counter() - t0
+    results["pdf_render_batch"] = {"n": len(batch), "seconds": elapsed, "reports_per_second": len(batch) / elapsed}
+    return results
+
+
+def bench_parsing(args):
+    from interview_core import build_system_prompt, format_portfolio, parse_report
+    cv_text = "Deneyim: Python, veri analizi, REST servisleri. " * 2000
+    portfolio = format_portfolio((f"proje{i}.pdf", cv_text[:20000]) for i in range(5))
+    return {
+        "report_parse": measure(lambda: parse_report(SAMPLE_REPORT_TEXT), repeat=args.repeat * 200),
+        "prompt_assembly": measure(lambda: build_system_prompt("Backend geliştirici", cv_text, portfolio),
+                                   repeat=args.repeat * 200),
+    }
+
+
+def bench_interview(args):
+    from fake_gemini import FakeBackend, FakeModel
+    from interview_core import Interview
+    from scheduler import Scheduler
+    backend = FakeBackend(latency=args.latency, tokens_per_second=args.tokens_per_second)
+    scheduler = Scheduler(requests_per_minute=10 ** 6, burst=10 ** 6, max_concurrent=64)
+    results = {}
+    # Başlatma: sistem promptu system_instruction olarak gittiği için ilk soru tek çağrıda gelir
+    start = lambda: Interview(lambda si: FakeModel(backend, system_instruction=si), "Backend geliştirici",
+                              "Python geliştirici CV", scheduler=scheduler, api_key="bench").start()
+    results["interview_start"] = measure(start, repeat=args.repeat)
+    for stream in (False, True):
+        interview = Interview(lambda si: FakeModel(backend, system_instruction=si), "Backend geliştirici", "Python geliştirici CV",
+                              scheduler=scheduler, api_key="bench", stream=stream)
+        interview.start()
+        first_token = []
+
+        def turn():
+            t0 = time.perf_counter()
+            interview.answer("Django ile REST servisleri yazdım.",
+                             on_first_token=lambda: first_token.append(time.perf_counter() - t0))
+
+        name = "interview_turn_stream" if stream else "interview_turn"
+        results[name] = measure(turn, repeat=args.repeat)
+        if stream: results["interview_time_to_first_token"] = {"n": len(first_token), "mean": statistics.fmean(first_token)}
+        results[name.replace("turn", "report")] = measure(interview.finish, repeat=1, warmup=0)
+
+    # Cevap bazlı puanlamada rapor süresi mülakat uzunluğundan bağımsız olmalı
+    from scoring import AnswerScorer
+    for turns in (3, 30):
+        model = FakeModel(backend)
+        interview = Interview(lambda si: FakeModel(backend, system_instruction=si), "Backend geliştirici",
+                              "Python geliştirici CV", scheduler=scheduler,
+                              api_key="bench", scorer=AnswerScorer(model, scheduler, "bench"))
+        interview.start()
+        for i in range(turns): interview.answer(f"Cevap {i}: Django ile REST servisleri yazdım.")
+        interview.scorer.finish()  # arka plandaki puanlamaların bitmesini bekle
+        results[f"interview_report_scored_{turns}turns"] = measure(interview.finish, repeat=1, warmup=0)
+
+    # Geçmiş sıkıştırma: 30. turda gönderilen token, 3. turdakine yakın kalmalı
+    from history import HistoryManager
+    model = FakeModel(backend)
+    interview = Interview(lambda si: FakeModel(backend, system_instruction=si), "Backend geliştirici",
+                          "Python geliştirici CV " * 200, scheduler=scheduler, api_key="bench",
+                          history=HistoryManager(None, model, budget=1500))
+    interview.start()
+    for i in range(30):
+        interview.answer(f"Cevap {i}: " + "Django ile REST servisleri yazdım ve testlerini kurdum. " * 10)
+        time.sleep(0.01)
+    tokens = interview.history.turn_tokens
+    results["history_tokens_turn3"] = {"n": 1, "tokens": tokens[2]}
+    results["history_tokens_turn30"] = {"n": 1, "tokens": tokens[29], "compactions": interview.history.compactions}
+    return results
+
+
+def bench_tts(args):
+    # Ağsız seslendirici ile boru hattı: ilk çalıştırma soğuk, tekrar eden yanıt önbellekten gelir.
+    # Doğruluk kontrolleri tests/test_tts.py içindedir.
+    from tts import StubSynthesizer, TTSEngine
+    stub = StubSynthesizer(delay=0.01)
+    engine = TTSEngine(stub, max_workers=3)
+    text = " ".join(f"Cümle {i} hakkında bir soru soruyorum." for i in range(12))
+
+    def streamed():
+        job = engine.job()
+        for end in range(0, len(text) + 1, 17): job.feed(text[:end])
+        return job.finish(text).audio_bytes()
+
+    t0 = time.perf_counter()
+    streamed()
+    results = {"tts_pipeline_cold": {"n": 1, "mean": time.perf_counter() - t0, "synth_calls": stub.calls}}
+    results["tts_pipeline_cached"] = measure(streamed, repeat=args.repeat)
+    return results
+
+
+def bench_scheduler(args):
+    # Zamanlayıcının çağrı başına ek maliyeti; 429 geri çekilmesi, öncelik ve eşzamanlılık kontrolleri
+    # tests/test_scheduler.py içindedir.
+    from scheduler import Scheduler
+    scheduler = Scheduler(requests_per_minute=10 ** 6, burst=10 ** 6)
+    return {"scheduler_call_overhead": measure(lambda: scheduler.call("bench", lambda: None), repeat=args.repeat * 200)}
+
+
+def bench_retrieval(args):
+    import retrieval
+    docs = [(f"proje{i}.pdf", f"Proje {i}: Kubernetes, Prometheus, Kafka ve Python ile veri hattı kurdum. " * 800)
+            for i in range(5)]
+    build = lambda: retrieval.BM25Index([c for name, text in docs for c in retrieval.chunk_text(text, name)])
+    index = build()
+    return {
+        "retrieval_index_build": measure(build, repeat=args.repeat),
+        "retrieval_search": measure(lambda: index.search("Kafka veri hattında hata yönetimi"), repeat=args.repeat * 200),
+    }
+
+
+def bench_session_store(args):
+    from session_store import SessionStore, jd_key
+    store = SessionStore(os.path.join(os.environ["MULAKAT_CACHE_DIR"], "bench_sessions.sqlite3"))
+    turns = [{"role": "assistant" if i % 2 else "user", "content": f"Tur {i}: " + "cevap metni " * 40} for i in range(20)]
+
+    def write_sessions(n=args.batch_reports):
+        # Betik iş parçacığının gördüğü maliyet sadece kuyruğa eklemektir; flush arka plan yazmasını da ölçer
+        for i in range(n):
+            sid = f"bench{time.perf_counter_ns()}{i}"
+            store.create(sid, f"aday{i % 100}.pdf", "models/fake", f"İlan {i % 10}", "sistem", [("cv.pdf", "metin")])
+            store.append_turns(sid, 0, turns)
+            store.finish(sid, dict(SAMPLE_REPORT, score=i % 100))
+        store.flush(timeout=120)
+
+    results = {"session_store_write": measure(write_sessions, repeat=args.repeat)}
+    sid = store.recent(limit=1)[0]["id"]
+    results["session_store_load"] = measure(lambda: store.load(sid), repeat=args.repeat * 4)
+    results["session_store_summary"] = measure(lambda: store.summary(jd_key("İlan 3"), 70), repeat=args.repeat * 4)
+    results["session_store_recent"] = measure(lambda: store.recent(limit=50), repeat=args.repeat * 4)
+    return results
+
+
+def bench_metrics(args):
+    # Ölçüm katmanı üretimde açık kalacağı için kayıt maliyeti tur süresinin yanında ihmal edilebilir olmalı
+    import metrics
+    state = {"messages": [{"role": "user", "content": "cevap metni " * 40} for _ in range(60)],
+             "extraction_stats": {"cv.pdf": {"pages": [{"page": i, "seconds": 0.01, "error": None} for i in range(40)]}}}
+
+    def observe_many(n=10000):
+        for i in range(n): metrics.observe("bench_seconds", i * 1e-5, kind="turn")
+
+    return {
+        "metrics_observe_10k": measure(observe_many, repeat=args.repeat),
+        "metrics_render": measure(metrics.render, repeat=args.repeat),
+        "metrics_session_size": measure(lambda: metrics.approx_size(state), repeat=args.repeat),
+    }
+
+
+def bench_ranking(args):
+    # İşe alım paneli: 10 bin adayın ağırlıklı sıralaması etkileşimli kalmalı
+    import numpy as np
+    from ranking import ReportTable
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 101, size=(10000, 5))
+    table = ReportTable()
+
+    def build():
+        table.__init__()
+        for i, row in enumerate(values.tolist()):
+            table.add(f"aday{i}", f"cv{i}.pdf", "ilan", {"values": row, "score": sum(row) // 5, "decision": "Olumlu"})
+        table.jds["ilan"].values
+
+    results = {"ranking_build_10k": measure(build, repeat=args.repeat)}
+    columns = table.jds["ilan"]
+    weights = iter(rng.uniform(0, 5, size=(10 ** 5, 5)))
+    results["ranking_rank_10k_top20"] = measure(lambda: columns.rank(next(weights), 20), repeat=args.repeat * 4)
+    results["ranking_percentile_bands_10k"] = measure(
+        lambda: (columns._percentiles.clear(), columns.category_percentiles()), repeat=args.repeat * 4)
+    return results
+
+
+SUITES = {"pdf_extract": bench_pdf_extract, "pdf_report": bench_pdf_report, "parsing": bench_parsing, "tts": bench_tts,
+          "scheduler": bench_scheduler, "retrieval": bench_retrieval, "interview": bench_interview, "session_store": bench_session_store,
+          "metrics": bench_metrics, "ranking": bench_ranking}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline_path, threshold):
+    with open(baseline_path, encoding="utf-8") as f: baseline = json.load(f)["results"]
+    regressions = []
+    for name, result in current.items():
+        old = baseline.get(name, {})
+        if "mean" not in result or "mean" not in old or not old["mean"]: continue
+        change = (result["mean"] - old["mean"]) / old["mean"]
+        flag = " !" if change > threshold else ""
+        print(f"{name:36s} {old['mean'] * 1000:10.3f} ms -> {result['mean'] * 1000:10.3f} ms  {change:+7.1%}{flag}")
+        if flag: regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI mülakat simülasyonu - performans ölçümleri")
+    parser.add_argument("--out", default="bench.json")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="Sadece seçilen grupları çalıştır")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pdf-pages", type=int, default=60)
+    parser.add_argument("--batch-reports", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2, help="Sahte modelin ilk token gecikmesi (sn)")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Gerileme sayılacak oran")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.suite or SUITES:
+        print(f"# {name}", file=sys.stderr)
+        results.update(SUITES[name](args))
+
+    payload = {"commit": git_commit(), "python": platform.python_version(), "machine": platform.machine(),
+               "timestamp": time.time(), "results": results}
+    with open(args.out, "w", encoding="utf-8") as f: json.dump(payload, f, indent=2)
+    print(f"Sonuçlar: {args.out}", file=sys.stderr)
+    if args.compare: return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import metrics
+from disk_cache import content_hash
+from pdf_extract import extract_pdf, read_source
+
+# --- Mülakat Başlatma Hattı ---
+# Belgeler yüklendiği anda (form gönderilmeden) arka planda çıkarılmaya başlar; "Mülakatı Başlat"
+# tıklandığında çoğu zaman sonuç hazırdır. Bağımsız adımlar eşzamanlı yürür ve her aşama zamanlanır.
+MAX_PREFETCHED = 64
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bootstrap")
+_extractions = OrderedDict()
+_lock = threading.Lock()
+
+
+def prefetch_document(source):
+    # Aynı içerik için tek bir çıkarma işi çalışır; tekrar çağrılar aynı future'ı döndürür
+    data = read_source(source)
+    key = content_hash(data)
+    with _lock:
+        future = _extractions.get(key)
+        if future is None or (future.done() and future.exception() is not None):
+            future = _extractions[key] = _executor.submit(extract_pdf, data)
+        _extractions.move_to_end(key)
+        while len(_extractions) > MAX_PREFETCHED: _extractions.popitem(last=False)
+    return future
+
+
+def submit(fn, *args, **kwargs):
+    return _executor.submit(fn, *args, **kwargs)
+
+
+class StageTimer:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.timings = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try: yield
+        finally:
+            self.timings[name] = time.perf_counter() - start
+            metrics.observe("bootstrap_stage_seconds", self.timings[name], stage=name)
+
+    def mark(self, name):
+        # Başlangıçtan bu ana kadar geçen süre (ör. ilk token)
+        self.timings[name] = time.perf_counter() - self.t0
+        metrics.observe("bootstrap_stage_seconds", self.timings[name], stage=name)
+
+    def total(self):
+        self.timings["toplam"] = time.perf_counter() - self.t0
+        metrics.observe("bootstrap_stage_seconds", self.timings["toplam"], stage="toplam")
+        return self.timings
@@ -0,0 +1,82 @@
+import hashlib
+import os
+import threading
+import time
+
+# --- Ortak Disk Önbelleği ---
+# İçerik hash'i ile adreslenen, boyut sınırlı basit bir dosya deposu.
+# Her kayıt tek bir dosyadır; erişimde mtime tazelenir, sınır aşılınca en eski erişilen silinir (LRU).
+CACHE_ROOT = os.environ.get("MULAKAT_CACHE_DIR", ".mulakat_cache")
+
+
+def content_hash(data):
+    if isinstance(data, str): data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class DiskCache:
+    def __init__(self, namespace, max_bytes=256 * 1024 * 1024, suffix=""):
+        self.dir = os.path.join(CACHE_ROOT, namespace)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        os.makedirs(self.dir, exist_ok=True)
+        self._remove_stale_tmp()
+        self._size = sum(size for _, size, _ in self._entries())
+
+    def _remove_stale_tmp(self, max_age=3600):
+        # Yarıda kalmış yazmalardan kalan geçici dosyalar
+        now = time.time()
+        for name in os.listdir(self.dir):
+            if not name.endswith(".tmp"): continue
+            p = os.path.join(self.dir, name)
+            try:
+                if now - os.path.getmtime(p) > max_age: os.remove(p)
+            except OSError: pass
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.dir):
+            if name.endswith(".tmp"): continue
+            try: info = os.stat(os.path.join(self.dir, name))
+            except OSError: continue
+            entries.append((name, info.st_size, info.st_mtime))
+        return entries
+
+    def path(self, key):
+        return os.path.join(self.dir, key + self.suffix)
+
+    def get(self, key):
+        p = self.path(key)
+        try:
+            with open(p, "rb") as f: data = f.read()
+        except OSError: return None
+        try: os.utime(p, None)
+        except OSError: pass
+        return data
+
+    def put(self, key, data):
+        p = self.path(key)
+        tmp = f"{p}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try: old_size = os.path.getsize(p)
+        except OSError: old_size = 0
+        try:
+            with open(tmp, "wb") as f: f.write(data)
+            os.replace(tmp, p)
+        finally:
+            if os.path.exists(tmp): os.remove(tmp)
+        with self._lock: self._size += len(data) - old_size
+        if self._size > self.max_bytes: self.evict()
+        return p
+
+    def evict(self):
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda e: e[2])
+            total = sum(size for _, size, _ in entries)
+            for name, size, _ in entries:
+                if total <= self.max_bytes: break
+                try:
+                    os.remove(os.path.join(self.dir, name))
+                    total -= size
+                except OSError: pass
+            self._size = total
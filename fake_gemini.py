@@ -0,0 +1,116 @@
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+
+# --- Sahte Gemini Arka Ucu ---
+# Ağ gerektirmeyen, deterministik yerel model. GenerativeModel / ChatSession arayüzünün
+# uygulamanın kullandığı kısmını taklit eder ve kota aşıldığında 429 hatası fırlatır.
+# latency: ilk token öncesi bekleme (sn), tokens_per_second: üretim hızı (kelime = token).
+
+
+def default_reply(prompt, history):
+    # Rapor istendiğinde uygulamanın beklediği biçimde, içerikten türetilmiş sabit puanlar döner
+    if prompt.startswith("CEVAP DEĞERLENDİRME"):
+        seed = hashlib.sha256(prompt.encode("utf-8")).digest()
+        scores = {cat: 40 + b % 60 for cat, b in zip(["TEKNİK", "İLETİŞİM", "PROBLEM_ÇÖZME", "TEORİK_BİLGİ", "POTANSİYEL"], seed)}
+        return json.dumps(dict(scores, **{"not": "Cevap somut bir örnek içeriyor."}), ensure_ascii=False)
+    if prompt.startswith("MÜLAKAT ÖZETİ"):
+        return json.dumps({"KARAR": "Olumlu", "RAPOR": "Sahte mülakat özeti."}, ensure_ascii=False)
+    if "SKOR:" in prompt:
+        seed = hashlib.sha256(repr(history).encode("utf-8")).digest()
+        values = [40 + b % 60 for b in seed[:5]]
+        score = sum(values) // len(values)
+        return (f"SKOR: {score}\nKARAR: {'Olumlu' if score >= 60 else 'Olumsuz'}\n-- PUAN DETAYLARI --\n"
+                f"TEKNİK: {values[0]}\nİLETİŞİM: {values[1]}\nPROBLEM_ÇÖZME: {values[2]}\n"
+                f"TEORİK_BİLGİ: {values[3]}\nPOTANSİYEL: {values[4]}\n-- SÖZEL RAPOR --\nSahte değerlendirme özeti.")
+    return f"Soru {len(history) // 2 + 1}: {prompt[:40]} hakkında bir örnek verebilir misiniz?"
+
+
+class RateLimitError(Exception):
+    def __init__(self, message="429 Resource has been exhausted (e.g. check quota)."):
+        super().__init__(message)
+
+
+class FakeBackend:
+    def __init__(self, requests_per_minute=None, reply=None, latency=0.0, tokens_per_second=None, clock=time.monotonic):
+        self.requests_per_minute = requests_per_minute
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.reply = reply or default_reply
+        self.clock = clock
+        self.calls = 0
+        self.rejected = 0
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def admit(self):
+        with self._lock:
+            self.calls += 1
+            if self.requests_per_minute is None: return
+            now = self.clock()
+            while self._recent and now - self._recent[0] >= 60: self._recent.popleft()
+            if len(self._recent) >= self.requests_per_minute:
+                self.rejected += 1
+                raise RateLimitError()
+            self._recent.append(now)
+
+    def generate(self, prompt, history):
+        self.admit()
+        return self.reply(prompt, history)
+
+    def token_delay(self):
+        return 1.0 / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def respond(self, text, stream):
+        if stream: return FakeResponse(text, self)
+        delay = self.latency + self.token_delay() * len(text.split(" "))
+        if delay: time.sleep(delay)
+        return FakeResponse(text)
+
+
+class FakeResponse:
+    def __init__(self, text, backend=None):
+        self.text = text
+        self._backend = backend
+
+    def __iter__(self):
+        # Akış: önce gecikme, sonra her kelime token hızında gelir
+        delay = self._backend.token_delay() if self._backend else 0.0
+        if self._backend and self._backend.latency: time.sleep(self._backend.latency)
+        words = self.text.split(" ")
+        for i, word in enumerate(words):
+            if delay and i: time.sleep(delay)
+            yield FakeResponse(word if i == len(words) - 1 else word + " ")
+
+    def resolve(self):
+        pass
+
+
+class FakeChat:
+    def __init__(self, backend, history=None):
+        self.backend = backend
+        self.history = list(history or [])
+
+    def send_message(self, message, stream=False):
+        text = self.backend.generate(message, self.history)
+        self.history += [{"role": "user", "parts": [message]}, {"role": "model", "parts": [text]}]
+        return self.backend.respond(text, stream)
+
+    def rewind(self):
+        # Gerçek ChatSession gibi son mesaj/yanıt çiftini geri alır
+        del self.history[-2:]
+
+
+class FakeModel:
+    def __init__(self, backend=None, model_name="models/fake-flash", system_instruction=None, **kwargs):
+        self.backend = backend or FakeBackend()
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+
+    def start_chat(self, history=None):
+        return FakeChat(self.backend, history)
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        return self.backend.respond(self.backend.generate(prompt, []), stream)
@@ -0,0 +1,151 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from disk_cache import content_hash
+
+# --- AI Koçu İpucu Önbelleği ---
+# Yeni soru ekrana geldiğinde ipucu arka planda önceden üretilir; buton tıklandığında hazırdır.
+# Anahtar, sorunun normalize edilmiş hash'idir; tekrar eden genel sorular oturumlar arasında paylaşılır.
+# İstatistikler: isabet/ıska ve hiç okunmadan düşen ön-üretimler (israf).
+# Ön-üretim kapatılabilir (MULAKAT_HINT_PREFETCH=0) ya da dakikalık sayıyla sınırlanabilir
+# (MULAKAT_HINT_PREFETCH_RPM); sınır aşılınca ön-üretim atlanır ve prefetch_skipped'da sayılır.
+HINT_PROMPT = "Adaya şu soru için cevabı söylemeden bir ipucu ver: {question}"
+
+_NOISE = re.compile(r"[^\w\s]+")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_question(text):
+    text = text.replace("İ", "i").replace("I", "ı").lower()
+    return _SPACE.sub(" ", _NOISE.sub(" ", text)).strip()
+
+
+def question_key(text):
+    return content_hash(normalize_question(text))
+
+
+class HintCache:
+    def __init__(self, max_entries=512, ttl=6 * 3600, prefetch_workers=4, prefetch=True, prefetch_per_minute=None,
+                 prefetch_wait=5.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.prefetch_enabled = prefetch
+        self.prefetch_per_minute = prefetch_per_minute
+        self.prefetch_wait = prefetch_wait  # tıklamada süren ön-üretimin en fazla beklenme süresi (sn)
+        self._prefetch_times = deque()
+        self._entries = OrderedDict()  # key -> [bitiş zamanı, ipucu, ön-üretim mi, okundu mu]
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="hint")
+        self.counters = {"hits": 0, "misses": 0, "prefetched": 0, "prefetch_used": 0, "prefetch_wasted": 0,
+                         "prefetch_skipped": 0}
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        if entry[2] and not entry[3]: self.counters["prefetch_wasted"] += 1
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None: return None
+        if entry[0] < time.time():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key, hint, prefetched):
+        with self._lock:
+            self._entries[key] = [time.time() + self.ttl, hint, prefetched, False]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries: self._drop(next(iter(self._entries)))
+            if prefetched: self.counters["prefetched"] += 1
+
+    def _run(self, key, generate, prefetched):
+        try:
+            with metrics.timer("hint_generate_seconds", prefetch=prefetched):
+                hint = generate()
+            self._store(key, hint, prefetched)
+            return hint
+        finally:
+            with self._lock: self._inflight.pop(key, None)
+
+    def _prefetch_allowed(self):
+        # Kilit altında çağrılır; son bir dakikadaki ön-üretim sayısı sınırı aşmamalı
+        if not self.prefetch_enabled: return False
+        if self.prefetch_per_minute is None: return True
+        now = time.monotonic()
+        while self._prefetch_times and now - self._prefetch_times[0] >= 60: self._prefetch_times.popleft()
+        if len(self._prefetch_times) >= self.prefetch_per_minute:
+            self.counters["prefetch_skipped"] += 1
+            return False
+        self._prefetch_times.append(now)
+        return True
+
+    def prefetch(self, question, generate):
+        # generate: ipucu metnini döndüren parametresiz fonksiyon (zamanlayıcıda "prefetch" önceliğiyle)
+        key = question_key(question)
+        with self._lock:
+            if self._lookup(key) is not None or key in self._inflight or not self._prefetch_allowed(): return
+            self._inflight[key] = self._pool.submit(self._run, key, generate, True)
+
+    def get(self, question, generate, timeout=None):
+        key = question_key(question)
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.counters["hits"] += 1
+                metrics.inc("hint_lookups_total", result="hit")
+                if entry[2] and not entry[3]: self.counters["prefetch_used"] += 1
+                entry[3] = True
+                return entry[1]
+            self.counters["misses"] += 1
+            future = self._inflight.get(key)
+        metrics.inc("hint_lookups_total", result="inflight" if future is not None else "miss")
+        if future is not None:
+            # Ön-üretim sürüyor: baştan istemek yerine kısa süre onu bekle (en düşük öncelikte kuyrukta
+            # kalmış olabilir); yetişmezse ya da başarısız olursa aşağıda ipucu önceliğiyle yeniden iste
+            try:
+                hint = future.result(timeout=self.prefetch_wait if timeout is None else timeout)
+                with self._lock:
+                    entry = self._lookup(key)
+                    if entry is not None:
+                        if entry[2] and not entry[3]: self.counters["prefetch_used"] += 1
+                        entry[3] = True
+                return hint
+            except Exception: pass
+        with metrics.timer("hint_generate_seconds", prefetch=False):
+            hint = generate()
+        self._store(key, hint, False)
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None: entry[3] = True
+        return hint
+
+    def stats(self):
+        with self._lock:
+            c = dict(self.counters)
+            c["size"] = len(self._entries)
+            c["inflight"] = len(self._inflight)
+        lookups = c["hits"] + c["misses"]
+        c["hit_ratio"] = c["hits"] / lookups if lookups else 0.0
+        c["prefetch_waste_ratio"] = c["prefetch_wasted"] / c["prefetched"] if c["prefetched"] else 0.0
+        return c
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_hint_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            rpm = os.environ.get("MULAKAT_HINT_PREFETCH_RPM")
+            _cache = HintCache(prefetch=os.environ.get("MULAKAT_HINT_PREFETCH", "1") != "0",
+                               prefetch_per_minute=float(rpm) if rpm else None)
+    return _cache
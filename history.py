@@ -0,0 +1,134 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Sohbet Geçmişi Yönetimi ---
+# Her send_message tüm geçmişi yeniden gönderir; uzun mülakatlarda maliyet ve gecikme tur başına büyür.
+# Sabit boyutlu sabitlenmiş bağlam (sistem talimatı + açılış) korunur, eski soru/cevap çiftleri bütçe
+# aşılınca arka planda özetlenir ve bir sonraki turdan önce geçmişe tek bir özet çifti olarak yerleştirilir.
+# Token sayımı yerel tahmindir (yaklaşık 4 karakter = 1 token); ağ çağrısı gerektirmez.
+PINNED_TOKENS = int(os.environ.get("MULAKAT_PINNED_TOKENS", 12000))
+HISTORY_TOKENS = int(os.environ.get("MULAKAT_HISTORY_TOKENS", 6000))
+KEEP_RECENT_TURNS = 3
+PINNED_ENTRIES = 2  # açılış mesajı ve ilk soru; sistem promptu system_instruction olarak ayrıca gider
+
+SUMMARY_PROMPT = """MÜLAKAT GEÇMİŞİ ÖZETİ
+Aşağıdaki mülakat bölümünü, sonraki soruları sorarken gerekecek her şeyi (adayın iddiaları, verdiği örnekler,
+tutarsızlıklar, sorulmuş konular) koruyarak kısa maddeler halinde özetle. Önceki özet varsa onu da birleştir.
+
+ÖNCEKİ ÖZET:
+{summary}
+
+BÖLÜM:
+{turns}
+"""
+SUMMARY_USER = "ÖNCEKİ BÖLÜMÜN ÖZETİ (bu konuları tekrar sorma, tutarlılık için kullan):\n{summary}"
+SUMMARY_ACK = "Anlaşıldı, mülakata bu bilgilerle devam ediyorum."
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="history")
+
+
+def estimate_tokens(text):
+    return (len(text) + 3) // 4
+
+
+def fit_text(text, budget):
+    # Baş (kimlik) ve son (kurallar) korunur, ortadaki belge metni kısaltılır
+    limit = budget * 4
+    if len(text) <= limit: return text
+    marker = "\n[... uzunluk sınırı nedeniyle kısaltıldı ...]\n"
+    head = (limit - len(marker)) * 2 // 3
+    tail = limit - len(marker) - head
+    return text[:head] + marker + text[-tail:]
+
+
+def content_text(content):
+    parts = content["parts"] if isinstance(content, dict) else content.parts
+    return "".join(p if isinstance(p, str) else getattr(p, "text", "") for p in parts)
+
+
+def content_role(content):
+    return content["role"] if isinstance(content, dict) else content.role
+
+
+class HistoryManager:
+    def __init__(self, chat, summary_model, scheduler=None, api_key=None, budget=HISTORY_TOKENS,
+                 pinned_budget=PINNED_TOKENS, keep_recent=KEEP_RECENT_TURNS):
+        self.chat = chat
+        self.summary_model = summary_model
+        self.scheduler = scheduler
+        self.api_key = api_key
+        self.budget = budget
+        self.pinned_budget = pinned_budget
+        self.keep_recent = keep_recent
+        self.summary = ""
+        self.system_tokens = 0
+        self.head = PINNED_ENTRIES
+        self.turn_tokens = []
+        self.compactions = 0
+        self._pending = None
+        self._lock = threading.Lock()
+
+    def attach(self, chat):
+        # Model sistem talimatıyla kurulduktan sonra sohbet bağlanır
+        self.chat = chat
+
+    def fit_pinned(self, system_prompt):
+        fitted = fit_text(system_prompt, self.pinned_budget)
+        self.system_tokens = estimate_tokens(fitted)
+        return fitted
+
+    def history_tokens(self):
+        return sum(estimate_tokens(content_text(c)) for c in self.chat.history)
+
+    def _summarize(self, summary, turns):
+        prompt = SUMMARY_PROMPT.format(summary=summary or "-", turns=turns)
+        call = lambda: self.summary_model.generate_content(prompt).text
+        if self.scheduler is None: return call()
+        return self.scheduler.call(self.api_key, call, kind="summary")
+
+    def _apply_ready(self):
+        # Arka plandaki özet hazırsa geçmişi yeniden kur; sadece betik iş parçacığında çağrılır
+        with self._lock:
+            pending = self._pending
+            if pending is None or not pending[0].done(): return
+            self._pending = None
+        future, count = pending
+        try: summary = future.result()
+        except Exception: return
+        history = list(self.chat.history)
+        pinned = history[:PINNED_ENTRIES]
+        recent = history[self.head + count:]
+        self.summary = summary
+        self.chat.history = pinned + [
+            {"role": "user", "parts": [SUMMARY_USER.format(summary=summary)]},
+            {"role": "model", "parts": [SUMMARY_ACK]},
+        ] + recent
+        self.head = PINNED_ENTRIES + 2
+        self.compactions += 1
+
+    def before_send(self, message):
+        self._apply_ready()
+        tokens = self.system_tokens + self.history_tokens() + estimate_tokens(message)
+        self.turn_tokens.append(tokens)
+        return tokens
+
+    def after_turn(self):
+        # Bütçe aşıldıysa en eski (son keep_recent tur hariç) çiftleri arka planda özetlemeye gönder
+        if self._pending is not None or self.history_tokens() <= self.budget: return
+        history = list(self.chat.history)
+        count = len(history) - self.head - self.keep_recent * 2
+        count -= count % 2
+        if count <= 0: return
+        turns = "\n".join(f"{'ADAY' if content_role(c) == 'user' else 'MÜLAKATÇI'}: {content_text(c)}"
+                          for c in history[self.head:self.head + count])
+        with self._lock:
+            self._pending = (_executor.submit(self._summarize, self.summary, turns), count)
+
+    def stats(self):
+        return {
+            "history_tokens": self.history_tokens(),
+            "last_turn_tokens": self.turn_tokens[-1] if self.turn_tokens else 0,
+            "compactions": self.compactions,
+            "summarizing": self._pending is not None,
+        }
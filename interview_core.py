@@ -0,0 +1,235 @@
+import re
+import time
+
+from history import content_role
+from llm import send_message
+
+# --- Mülakat Çekirdeği ---
+# Streamlit'ten bağımsız mülakat mantığı: sistem promptu, tur döngüsü, rapor promptu ve rapor ayrıştırma.
+# Hem mulakatapp.py hem de toplu tarama (batch_screen.py) bu modülü kullanır.
+CATEGORIES = ["TEKNİK", "İLETİŞİM", "PROBLEM_ÇÖZME", "TEORİK_BİLGİ", "POTANSİYEL"]
+OPENING_MESSAGE = "ANALİZİNİ TAMAMLA VE MÜLAKATI BAŞLAT. Şimdi belirlenen kimliğe bürün, kendini tanıt ve adaya ilk sorunu sor."
+TIMEOUT_ANSWER = "Süre doldu, cevap veremedim."
+CONTEXT_HEADER = "[İLGİLİ BELGE BÖLÜMLERİ - adayın belgelerinden bu mesajla ilgili kısımlar; soru sorarken kullan]"
+
+SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
+]
+
+WELCOME_TEXT = """
+**👋 Mülakat Simülasyonuna Hoş Geldiniz!**
+
+Bu mülakat, yapay zeka destekli bir simülasyon üzerinden gerçekleştirilecektir. Amaç, sizi tanımak ve deneyimlerinizi daha iyi anlayabilmektir; stres yaratmak değil.
+
+ℹ️ **İşleyiş:**
+* Mülakat sırasında sorulara ister **yazarak** ister **konuşarak** cevap verebilirsiniz.
+* 🎤 **Mikrofon:** Butona bir kez bastığınızda kayıt başlar, tekrar bastığınızda kayıt durur. Tarayıcınız sesinizi otomatik olarak yazıya çevirecektir.
+* ⏳ **Süre:** Her bir soru için maksimum 5 dakikalık bir süre bulunmaktadır. **5 dakika içinde cevap vermezseniz sistem mülakatı sonlandıracaktır.**
+* 💡 **İpucu:** Sorulara kendi deneyimlerinizi yansıtan, samimi ve açık cevaplar vermeniz yeterlidir.
+
+*Not: Yapay zeka, insan kaynaklarının yerini almaz; yalnızca değerlendirme sürecini destekleyen bir araç olarak kullanılmaktadır.*
+
+**Size iyi bir mülakat deneyimi dileriz, başarılar! 🍀**
+"""
+
+REPORT_PROMPT = """
+MÜLAKAT BİTTİ. Detaylı analiz yap.
+🚨 KURAL: EĞER ADAY CEVAP VERMEDİYSE VEYA SÜRE DOLDUYSA PUAN 0 OLSUN.
+FORMAT:
+SKOR: (0-100 arası sadece sayı)
+KARAR: (Olumlu / Olumsuz)
+-- PUAN DETAYLARI --
+TEKNİK: (0-100)
+İLETİŞİM: (0-100)
+PROBLEM_ÇÖZME: (0-100)
+TEORİK_BİLGİ: (0-100)
+POTANSİYEL: (0-100)
+-- SÖZEL RAPOR --
+(Kısa bir özet yaz)
+"""
+
+_SCORE_RE = re.compile(r"SKOR[:\s*]*(\d+)", re.IGNORECASE)
+_DECISION_RE = re.compile(r"KARAR[:\s*]*(.+)", re.IGNORECASE)
+_CATEGORY_RES = [(cat, re.compile(rf"{cat}[:\s*]*(\d+)", re.IGNORECASE)) for cat in CATEGORIES]
+
+
+def format_portfolio(files):
+    # files: (dosya adı, metin) çiftleri
+    return "".join(f"\n--- DOSYA: {name} ---\n{text}\n" for name, text in files)
+
+
+def portfolio_outline(names):
+    # Erişim indeksi kullanılırken portfolyonun tamamı yerine sadece dosya adları prompta girer
+    names = list(names)
+    if not names: return ""
+    return f"Dosyalar: {', '.join(names)}. İlgili bölümler her mesajda [İLGİLİ BELGE BÖLÜMLERİ] başlığıyla eklenecek."
+
+
+def format_chunks(chunks):
+    return "\n\n".join(f"[{c['source']}] {c['text']}" for c in chunks)
+
+
+def with_context(message, chunks):
+    if not chunks: return message
+    return f"{message}\n\n{CONTEXT_HEADER}\n{format_chunks(chunks)}"
+
+
+def drop_context(chat, message):
+    # Yanıt geldikten sonra son kullanıcı girdisindeki belge parçaları geçmişten çıkarılır: parçalar sadece
+    # kendi turunda gider, sonraki turlarda geçmişle tekrar tekrar gönderilmez
+    history = list(chat.history)
+    if len(history) < 2 or content_role(history[-2]) != "user": return
+    history[-2] = {"role": "user", "parts": [message]}
+    chat.history = history
+
+
+def build_system_prompt(job_description, cv_text, portfolio_text):
+    return f"""
+    === SİSTEM KİMLİĞİ VE AMACI ===
+    SEN, "AI-Powered Senior Talent Assessment Agent" (Yapay Zeka Destekli Kıdemli Yetenek Değerlendirme Uzmanı) OLARAK GÖREV YAPMAKTASIN. 
+    AMACIN: Aşağıda sunulan veri setlerini analiz ederek, aday ile gerçekçi, yetkinlik bazlı ve yapılandırılmış bir teknik mülakat gerçekleştirmektir.
+    
+    === BAĞLAMSAL VERİ SETİ (CONTEXT) ===
+    1. HEDEF POZİSYON (JD): {job_description}
+    2. ADAY PROFİLİ (CV): {cv_text}
+    3. EK DÖKÜMANLAR (PORTFOLYO): {portfolio_text}
+    
+    === YÜRÜTME ALGORİTMASI (EXECUTION PROTOCOL) ===
+    
+    ADIM 1: DİNAMİK ROL ADAPTASYONU (DYNAMIC PERSONA)
+    - İş İlanını (JD) analiz et ve sektörü belirle (Örn: Yazılım, Eğitim, Finans).
+    - İlgili sektöre uygun "Hiring Manager" (İşe Alım Yöneticisi) kimliğine bürün.
+    - Dil ve Ton Ayarı: Sektörel jargon kullan (Örn: Yazılımcı için "Tech Stack", Öğretmen için "Pedagojik Formasyon").
+    
+    ADIM 2: YETKİNLİK SORGULAMA STRATEJİSİ (CBI - Competency Based Interviewing)
+    - Adayın beyanlarını asla yüzeyden kabul etme. "Derinlemesine Sorgulama" (Deep-Dive) yap.
+    - STAR Metodolojisi Entegrasyonu (Implicit Guidance): Adaya doğrudan "STAR kullan" demek yerine, sorularınla onu yönlendir.
+    - Tutarlılık Analizi: CV'deki iddialar ile sohbet sırasındaki cevaplar arasındaki tutarsızlıkları yakala.
+    
+    ADIM 3: SENARYO BAZLI TEST (SITUATIONAL JUDGEMENT)
+    - Adayı teorik bilgiden çıkarıp pratik uygulamaya yönlendir.
+    - Anlık kriz senaryoları üret (Örn: "Sistem çöktü", "Veli şikayet etti") ve çözüm reflekslerini ölç.
+    
+    === KISITLAMALAR VE KURALLAR (CONSTRAINTS) ===
+    1. TEK SORU PRENSİBİ: Bilişsel yükü yönetmek için her seferinde SADECE BİR soru sor.
+    2. OBJEKTİFLİK: Duygusal tepkiler verme, analitik ve profesyonel kal.
+    3. KOPYALA-YAPIŞTIR ENGELİ: Adayın yapay veya ezber cevap verdiğini hissedersen, "Bunu kendi deneyiminle örneklendir" diyerek müdahale et.
+    
+    === BAŞLATMA ===
+    Analizini tamamla, belirlediğin kimliğe bürün, kendini profesyonelce tanıt ve CV/Portfolyo analizine dayalı en kritik ilk sorunu yönelt.
+    """
+
+
+def parse_report(full_text):
+    # SKOR satırı bulunamazsa puan 0 değil None olur; okunamayan rapor aday aleyhine sıralanmaz
+    score = None
+    decision = "Belirsiz"
+
+    score_match = _SCORE_RE.search(full_text)
+    if score_match: score = int(score_match.group(1))
+
+    decision_match = _DECISION_RE.search(full_text)
+    if decision_match: decision = decision_match.group(1).strip()
+
+    values = []
+    missing = []
+    for cat, pattern in _CATEGORY_RES:
+        cat_match = pattern.search(full_text)
+        if cat_match: values.append(int(cat_match.group(1)))
+        else:
+            values.append(50)
+            missing.append(cat)
+
+    parts = full_text.split("-- SÖZEL RAPOR --", 1)
+    verbal_report = parts[1] if len(parts) > 1 else full_text
+
+    return {
+        "score": score,
+        "decision": decision,
+        "categories": list(CATEGORIES),
+        "values": values,
+        "text": verbal_report,
+        "missing": missing
+    }
+
+
+def resumable_messages(messages):
+    # Cevabı kaydedilmeden kopan son aday mesajı atılır; aday o soruyu yeniden cevaplar
+    messages = list(messages)
+    while messages and messages[-1]["role"] == "user": messages.pop()
+    return messages
+
+
+def restore_history(messages):
+    # Kayıtlı mesajlardan sohbet geçmişi yerel olarak kurulur; modele yeniden priming yapılmaz.
+    # İlk giriş açılış mesajıdır (history.PINNED_ENTRIES ile uyumlu), karşılama metni modele ait değildir.
+    history = [{"role": "user", "parts": [OPENING_MESSAGE]}]
+    for m in resumable_messages(messages):
+        if m["content"] == WELCOME_TEXT: continue
+        history.append({"role": "user" if m["role"] == "user" else "model", "parts": [m["content"]]})
+    return history
+
+
+class Interview:
+    # Tek bir mülakatın tur döngüsü. model_factory(system_instruction) sistem promptu talimat olarak
+    # verilmiş bir model döndürür; böylece kimlik/analiz ve ilk soru tek çağrıda gelir.
+    # scheduler verilirse tüm çağrılar onun üzerinden yapılır.
+    # scorer (scoring.AnswerScorer) verilirse her cevap anında puanlanır ve rapor onunla oluşturulur.
+    # history (history.HistoryManager) verilirse geçmiş token bütçesiyle sıkıştırılır.
+    # retriever (retrieval.BM25Index) verilirse her mesaja sadece ilgili portfolyo parçaları eklenir (geçmişte kalmaz).
+    def __init__(self, model_factory, job_description, cv_text, portfolio_text="", scheduler=None, api_key=None,
+                 stream=False, scorer=None, history=None, retriever=None):
+        self.job_description = job_description
+        self.retriever = retriever
+        self.history = history
+        self.system_prompt = build_system_prompt(job_description, cv_text, portfolio_text)
+        if self.history is not None: self.system_prompt = self.history.fit_pinned(self.system_prompt)
+        self.chat = model_factory(self.system_prompt).start_chat(history=[])
+        if self.history is not None: self.history.attach(self.chat)
+        self.scheduler = scheduler
+        self.api_key = api_key
+        self.stream = stream
+        self.scorer = scorer
+        self.messages = []
+        self.turn_seconds = []
+
+    def send(self, message, kind="turn", on_first_token=None, on_text=None):
+        call = lambda: send_message(self.chat, message, stream=self.stream, on_first_token=on_first_token, on_text=on_text)
+        if self.scheduler is None: return call()
+        return self.scheduler.call(self.api_key, call, kind=kind)
+
+    def with_context(self, message, query):
+        if self.retriever is None: return message
+        return with_context(message, self.retriever.search(query))
+
+    def start(self):
+        first_question = self.send(self.with_context(OPENING_MESSAGE, self.job_description), kind="priming")
+        if self.retriever is not None: drop_context(self.chat, OPENING_MESSAGE)
+        self.messages = [
+            {"role": "assistant", "content": WELCOME_TEXT},
+            {"role": "assistant", "content": first_question}
+        ]
+        return first_question
+
+    def answer(self, text, **callbacks):
+        # Yanıt alınamazsa (llm.ReplyError vb.) tur sohbetten geri alınmıştır; cevap mesajlara da yazılmaz
+        t0 = time.perf_counter()
+        question = self.messages[-1]["content"]
+        message = self.with_context(text, text)
+        if self.history is not None: self.history.before_send(message)
+        reply = self.send(message, **callbacks)
+        if message != text: drop_context(self.chat, text)
+        if self.history is not None: self.history.after_turn()
+        if self.scorer is not None: self.scorer.submit(question, text)
+        self.messages.append({"role": "user", "content": text})
+        self.messages.append({"role": "assistant", "content": reply})
+        self.turn_seconds.append(time.perf_counter() - t0)
+        return reply
+
+    def finish(self, **callbacks):
+        if self.scorer is not None: return self.scorer.finish()
+        full_text = self.send(REPORT_PROMPT, kind="report", **callbacks)
+        return parse_report(full_text)
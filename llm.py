@@ -0,0 +1,84 @@
+import time
+
+import metrics
+
+# --- Gemini Çağrı Yardımcıları ---
+# stream=True iken yanıt parça parça okunur: on_first_token ilk parça geldiğinde,
+# on_text her parçada o ana kadarki toplam metinle çağrılır.
+# Süre, ilk parça gecikmesi ve token sayıları metrics modülüne yazılır.
+# Yanıt yarıda kesilirse, güvenlik vb. nedenle durursa veya hiç metin gelmezse son tur geçmişten geri alınır
+# (chat.rewind) ve ReplyError fırlatılır; aksi halde bozuk tur chat.history okumasını da kırar.
+
+OK_FINISH_REASONS = {None, "FINISH_REASON_UNSPECIFIED", "STOP", "MAX_TOKENS"}
+
+
+class ReplyError(RuntimeError):
+    pass
+
+
+def finish_reason(response):
+    try: reason = response.candidates[0].finish_reason
+    except (AttributeError, IndexError, TypeError): return None
+    return getattr(reason, "name", reason)
+
+
+def rewind(chat):
+    # Bekleyen (yarım kalmış) mesaj/yanıt çifti geçmişe yazılmadan atılır
+    try: chat.rewind()
+    except Exception: pass
+
+
+def record_usage(response, message, text):
+    # usage_metadata yoksa (ör. sahte model) yaklaşık 4 karakter = 1 token
+    usage = getattr(response, "usage_metadata", None)
+    prompt = getattr(usage, "prompt_token_count", None) or (len(message) + 3) // 4
+    output = getattr(usage, "candidates_token_count", None) or (len(text) + 3) // 4
+    metrics.inc("llm_tokens_total", prompt, direction="prompt")
+    metrics.inc("llm_tokens_total", output, direction="response")
+
+
+def send_message(chat, message, stream=False, on_first_token=None, on_text=None):
+    t0 = time.perf_counter()
+    mode = "stream" if stream else "block"
+    if not stream:
+        response = chat.send_message(message)
+        try: text = response.text
+        except ValueError: text = ""
+        if not text:
+            rewind(chat)
+            raise ReplyError("Model boş yanıt döndürdü, tekrar deneyin.")
+        metrics.observe("llm_first_token_seconds", time.perf_counter() - t0, mode=mode)
+        if on_first_token: on_first_token()
+        if on_text: on_text(text)
+        metrics.observe("llm_seconds", time.perf_counter() - t0, mode=mode)
+        record_usage(response, message, text)
+        return text
+
+    response = chat.send_message(message, stream=True)
+    parts = []
+    try:
+        for chunk in response:
+            try: piece = chunk.text
+            except ValueError: continue  # metin içermeyen (ör. sadece güvenlik bilgisi) parça
+            if not piece: continue
+            if not parts:
+                metrics.observe("llm_first_token_seconds", time.perf_counter() - t0, mode=mode)
+                if on_first_token: on_first_token()
+            parts.append(piece)
+            if on_text: on_text("".join(parts))
+        # Sohbet geçmişi ancak akış tamamen tüketildiğinde güncellenir
+        response.resolve()
+    except Exception as e:
+        rewind(chat)
+        raise ReplyError(f"Model yanıtı yarıda kesildi, tekrar deneyin: {e}") from e
+    reason = finish_reason(response)
+    if reason not in OK_FINISH_REASONS:
+        rewind(chat)
+        raise ReplyError(f"Model yanıtı tamamlanmadı ({reason}), tekrar deneyin.")
+    text = "".join(parts)
+    if not text:
+        rewind(chat)
+        raise ReplyError("Model boş yanıt döndürdü, tekrar deneyin.")
+    metrics.observe("llm_seconds", time.perf_counter() - t0, mode=mode)
+    record_usage(response, message, text)
+    return text
@@ -0,0 +1,231 @@
+import bisect
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Ölçümler ---
+# Sıcak yolların (Gemini çağrısı, TTS, PDF rapor/çıkarma, ipucu, font indirme, Streamlit yeniden
+# çalıştırma) gecikme histogramları, sayaçlar ve göstergeler süreç genelinde tutulur ve Prometheus
+# metin formatında dışa aktarılır. MULAKAT_METRICS_PORT verilirse yerel bir /metrics uç noktası açılır.
+# Kayıt bir kilit ve sabit kova aramasından ibarettir; üretimde açık bırakılabilir.
+PREFIX = "mulakat_"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7, 1e8)
+
+DESCRIPTIONS = {
+    "llm_seconds": "send_message toplam süresi",
+    "llm_first_token_seconds": "send_message ilk parça gecikmesi",
+    "llm_tokens_total": "Gemini token sayısı (usage_metadata yoksa yaklaşık)",
+    "model_call_seconds": "Zamanlayıcı üzerinden model çağrısı (kuyruk ve yeniden denemeler dahil)",
+    "scheduler_wait_seconds": "Zamanlayıcı kuyruğunda bekleme süresi",
+    "model_calls_total": "Zamanlayıcıya gelen model çağrıları",
+    "model_retries_total": "429 sonrası yeniden denemeler",
+    "model_failures_total": "Başarısız model çağrıları",
+    "tts_seconds": "Yanıtın seslendirilmesi için betiğin beklediği süre",
+    "tts_synth_seconds": "Tek cümlenin seslendirilmesi",
+    "tts_failures_total": "Seslendirilemeyen cümleler",
+    "pdf_report_seconds": "create_pdf_report süresi",
+    "pdf_extract_seconds": "extract_pdf süresi",
+    "pdf_pages_total": "Çıkarılan PDF sayfaları",
+    "pdf_text_wait_seconds": "get_pdf_text içinde ön çıkarmanın beklenmesi",
+    "hint_generate_seconds": "İpucu üretimi",
+    "hint_lookups_total": "İpucu önbelleği aramaları",
+    "font_download_seconds": "Font indirme",
+    "bootstrap_stage_seconds": "Mülakat başlatma aşamaları",
+    "session_store_errors_total": "Oturum deposunda başarısız yazmalar",
+    "ranking_seconds": "Aday sıralama tablosu yenileme ve sıralama",
+    "script_run_seconds": "Streamlit betik/fragment çalıştırma süresi",
+    "session_state_bytes": "Oturum durumunun yaklaşık bellek boyutu",
+    "process_resident_bytes": "Sürecin yerleşik belleği (RSS)",
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        # Kova üst sınırından tahmin; son (+Inf) kovada en büyük sınır döner
+        if not self.count: return 0.0
+        target, seen = q * self.count, 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= target: return bound
+        return self.buckets[-1]
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key, extra=()):
+    items = list(key) + list(extra)
+    if not items: return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None: hist = self._histograms[key] = Histogram(buckets)
+            hist.observe(value)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock: self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock: self._gauges[(name, _label_key(labels))] = value
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try: yield labels
+        finally: self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name, **labels):
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels): return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def render(self):
+        # Prometheus metin formatı (0.0.4)
+        self.set_gauge("process_resident_bytes", process_memory())
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+        lines, declared = [], set()
+
+        def declare(name, kind):
+            if name in declared: return
+            declared.add(name)
+            lines.append(f"# HELP {PREFIX}{name} {DESCRIPTIONS.get(name, name)}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        for (name, key), hist in histograms:
+            declare(name, "histogram")
+            cumulative = 0
+            for bound, n in zip(hist.buckets, hist.counts):
+                cumulative += n
+                lines.append(f"{PREFIX}{name}_bucket{_format_labels(key, [('le', repr(float(bound)))])} {cumulative}")
+            lines.append(f"{PREFIX}{name}_bucket{_format_labels(key, [('le', '+Inf')])} {hist.count}")
+            lines.append(f"{PREFIX}{name}_sum{_format_labels(key)} {hist.sum}")
+            lines.append(f"{PREFIX}{name}_count{_format_labels(key)} {hist.count}")
+        for (name, key), value in counters:
+            declare(name, "counter")
+            lines.append(f"{PREFIX}{name}{_format_labels(key)} {value}")
+        for (name, key), value in gauges:
+            declare(name, "gauge")
+            lines.append(f"{PREFIX}{name}{_format_labels(key)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        # Yönetici paneli için satırlar: histogramlar ms cinsinden (boyutlar bayt), sayaçlar toplam
+        with self._lock:
+            rows = [{"ölçüm": name, "etiketler": ",".join(f"{k}={v}" for k, v in key), "adet": h.count,
+                     "ortalama": h.sum / h.count if h.count else 0.0, "p50": h.quantile(0.5), "p95": h.quantile(0.95)}
+                    for (name, key), h in sorted(self._histograms.items())]
+            rows += [{"ölçüm": name, "etiketler": ",".join(f"{k}={v}" for k, v in key), "adet": value}
+                     for (name, key), value in sorted(self._counters.items())]
+        for row in rows:
+            if row["ölçüm"].endswith("_seconds"):
+                for k in ("ortalama", "p50", "p95"): row[k] = round(row[k] * 1000, 1)
+        return rows
+
+
+def process_memory():
+    # Güncel RSS (Linux); yoksa en yüksek RSS
+    try:
+        with open("/proc/self/statm") as f: return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        try: import resource
+        except ImportError: return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def approx_size(obj, max_depth=6, max_nodes=50000):
+    # Kaba derin boyut: kapsayıcılar ve düz nesnelerin __dict__'i gezilir; düğüm sayısı sınırlıdır
+    seen, total, stack = set(), 0, [(obj, 0)]
+    while stack and len(seen) < max_nodes:
+        item, depth = stack.pop()
+        if id(item) in seen: continue
+        seen.add(id(item))
+        try: total += sys.getsizeof(item)
+        except TypeError: continue
+        if depth >= max_depth or isinstance(item, (str, bytes, bytearray, int, float)): continue
+        if isinstance(item, dict): children = list(item.keys()) + list(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)): children = list(item)
+        elif hasattr(item, "__dict__") and not isinstance(item, type): children = [vars(item)]
+        else: continue
+        stack.extend((child, depth + 1) for child in children)
+    return total
+
+
+_metrics = Metrics()
+observe = _metrics.observe
+inc = _metrics.inc
+set_gauge = _metrics.set_gauge
+timer = _metrics.timer
+timed = _metrics.timed
+render = _metrics.render
+summary = _metrics.summary
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args): pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve(port=None, host="127.0.0.1"):
+    # Süreç başına bir kez; port verilmezse MULAKAT_METRICS_PORT okunur, o da yoksa sunucu açılmaz
+    global _server
+    port = port or os.environ.get("MULAKAT_METRICS_PORT")
+    if not port: return None
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((os.environ.get("MULAKAT_METRICS_HOST", host), int(port)), _Handler)
+            threading.Thread(target=_server.serve_forever, daemon=True, name="metrics").start()
+    return _server
@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+import time
+
+import google.generativeai as genai
+from google.ai import generativelanguage as glm
+
+from disk_cache import content_hash
+
+# --- Model Kayıt Defteri ---
+# Tüm oturumlar için ortak, API anahtarına göre ayrılmış istemci ve model havuzu.
+# genai.configure süreç genelinde tek bir anahtar tuttuğu için her anahtarın kendi istemcisi
+# oluşturulur ve modellere bu istemci atanır; böylece farklı anahtarlı oturumlar birbirini ezmez.
+MODEL_LIST_TTL = 600
+DEFAULT_MODELS = ["models/gemini-1.5-flash", "gemini-1.5-flash"]
+
+
+class ModelRegistry:
+    def __init__(self, ttl=MODEL_LIST_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._models = {}
+        self._model_lists = {}
+        self._pending = {}
+
+    def _key(self, api_key):
+        return content_hash(api_key)[:16]
+
+    def _client_for(self, api_key):
+        key = self._key(api_key)
+        with self._lock:
+            clients = self._clients.get(key)
+            if clients is None:
+                options = {"api_key": api_key}
+                clients = {
+                    "generative": glm.GenerativeServiceClient(client_options=options),
+                    "model": glm.ModelServiceClient(client_options=options),
+                }
+                self._clients[key] = clients
+        return clients
+
+    def _fetch_models(self, api_key):
+        models = genai.list_models(client=self._client_for(api_key)["model"])
+        names = [m.name for m in models if 'generateContent' in m.supported_generation_methods]
+        names.sort(key=lambda x: "flash" not in x)
+        return names
+
+    def cached_models(self, api_key):
+        entry = self._model_lists.get(self._key(api_key))
+        if entry and time.time() - entry[0] < self.ttl: return entry[1]
+        return None
+
+    def list_models(self, api_key, force=False):
+        if not force:
+            cached = self.cached_models(api_key)
+            if cached is not None: return cached
+        key = self._key(api_key)
+        with self._lock:
+            # Aynı anahtar için süren bir listeleme varsa onu bekle
+            event = self._pending.get(key)
+            owner = event is None
+            if owner:
+                event = threading.Event()
+                self._pending[key] = event
+        if not owner:
+            event.wait()
+            cached = self.cached_models(api_key)
+            if cached is not None: return cached
+            return self.list_models(api_key, force=True)
+        try:
+            names = self._fetch_models(api_key)
+            self._model_lists[key] = (time.time(), names)
+            return names
+        finally:
+            with self._lock: self._pending.pop(key, None)
+            event.set()
+
+    def warm_up(self, api_key):
+        # Arka planda listele; hata olursa kullanıcı butona bastığında tekrar denenir
+        if not api_key or self.cached_models(api_key) is not None: return
+        def run():
+            try: self.list_models(api_key)
+            except Exception: pass
+        threading.Thread(target=run, daemon=True).start()
+
+    def new_model(self, api_key, model_name, **kwargs):
+        # Oturuma özel modeller (ör. CV içeren system_instruction) paylaşılmaz ve saklanmaz; istemci yine ortaktır
+        model = genai.GenerativeModel(model_name=model_name, **kwargs)
+        model._client = self._client_for(api_key)["generative"]
+        return model
+
+    def get_model(self, api_key, model_name, **kwargs):
+        key = (self._key(api_key), model_name, json.dumps(kwargs, sort_keys=True, default=str))
+        model = self._models.get(key)
+        if model is None:
+            model = self.new_model(api_key, model_name, **kwargs)
+            with self._lock: model = self._models.setdefault(key, model)
+        return model
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    # Süreç başına tek kayıt defteri; ortamda GOOGLE_API_KEY varsa sunucu açılırken ısıtılır
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+            _registry.warm_up(os.environ.get("GOOGLE_API_KEY"))
+    return _registry
@@ -1,122 +1,158 @@
 import streamlit as st
-import google.generativeai as genai
-from pypdf import PdfReader
 import time
-import plotly.graph_objects as go
-from fpdf import FPDF
 import os
-import requests
-import tempfile
-import re
+import plotly.graph_objects as go
+import threading
 from streamlit_mic_recorder import speech_to_text 
+from bootstrap import StageTimer, prefetch_document, submit
+from llm import send_message
+from tts import TTSEngine
+from report_pdf import create_pdf_report, ensure_fonts
+from model_registry import DEFAULT_MODELS, get_registry
+from scheduler import get_scheduler
+from interview_core import (OPENING_MESSAGE, SAFETY_SETTINGS, TIMEOUT_ANSWER, WELCOME_TEXT,
+                            build_system_prompt, drop_context, portfolio_outline, restore_history,
+                            resumable_messages, with_context)
+from retrieval import get_index
+from scoring import JSON_CONFIG, AnswerScorer
+from hint_cache import HINT_PROMPT, get_hint_cache
+from history import HistoryManager
+from session_store import get_store, jd_key, new_session_id, new_session_secret
+import metrics
+import admin_auth
+
+script_started = time.perf_counter()  # tam betik çalıştırma süresi (sonda ölçülür)
+MESSAGE_WINDOW = 12  # ekranda çizilen son mesaj sayısı; öncekiler istenirse gösterilir
+IS_ADMIN = os.environ.get("MULAKAT_ADMIN") == "1"  # sadece ölçüm paneli; aday verileri için admin_auth girişi gerekir
 
 # --- Sayfa Ayarları ---
 st.set_page_config(page_title="AI Mülakat Simülasyonu", layout="wide")
 st.title("🤖 AI Mülakat Simülasyonu")
 
 # --- 1. FONKSİYONLAR ---
-def check_and_download_fonts():
-    fonts = {
-        "Roboto-Regular.ttf": "https://github.com/google/fonts/raw/main/apache/roboto/Roboto-Regular.ttf",
-        "Roboto-Bold.ttf": "https://github.com/google/fonts/raw/main/apache/roboto/Roboto-Bold.ttf"
-    }
-    for font_name, url in fonts.items():
-        if not os.path.exists(font_name):
-            try:
-                response = requests.get(url, timeout=5)
-                if response.status_code == 200:
-                    with open(font_name, 'wb') as f:
-                        f.write(response.content)
-            except: pass
-
-def tr_to_en(text):
-    if not text: return ""
-    tr_map = {'ğ':'g','Ğ':'G','ş':'s','Ş':'S','ı':'i','İ':'I','ç':'c','Ç':'C','ü':'u','Ü':'U','ö':'o','Ö':'O'}
-    for tr, en in tr_map.items(): text = text.replace(tr, en)
-    return text
+@st.cache_resource
+def get_tts_engine():
+    return TTSEngine()
 
-def text_to_speech(text):
-    try:
-        from gTTS import gTTS 
-        tts = gTTS(text=text, lang='tr')
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_mp3:
-            tts.save(tmp_mp3.name)
-            return tmp_mp3.name
-    except: return None
-
-def create_pdf_report(data):
-    check_and_download_fonts()
-    use_font = 'Arial'
-    if os.path.exists('Roboto-Bold.ttf') and os.path.exists('Roboto-Regular.ttf'):
-        use_font = 'Roboto'
-
-    class PDF(FPDF):
-        def header(self):
-            if use_font == 'Roboto':
-                try:
-                    self.add_font('Roboto', 'B', 'Roboto-Bold.ttf', uni=True)
-                    self.add_font('Roboto', '', 'Roboto-Regular.ttf', uni=True)
-                except: pass
-            self.set_font(use_font, 'B', 20)
-            self.cell(0, 10, 'AI MULAKAT SONUC RAPORU', 0, 1, 'C')
-            self.ln(10)
-        def chapter_title(self, title):
-            self.set_font(use_font, 'B', 14)
-            self.set_fill_color(230, 230, 230)
-            safe_title = title if use_font == 'Roboto' else tr_to_en(title)
-            self.cell(0, 10, safe_title, 0, 1, 'L', fill=True)
-            self.ln(4)
-        def chapter_body(self, body):
-            self.set_font(use_font, '', 11)
-            safe_body = body if use_font == 'Roboto' else tr_to_en(body)
-            if use_font == 'Arial': safe_body = safe_body.encode('latin-1', 'ignore').decode('latin-1')
-            self.multi_cell(0, 6, safe_body)
-            self.ln(5)
-
-    pdf = PDF()
-    if use_font == 'Roboto':
-        try:
-            pdf.add_font('Roboto', 'B', 'Roboto-Bold.ttf', uni=True)
-            pdf.add_font('Roboto', '', 'Roboto-Regular.ttf', uni=True)
-        except: pass
-    pdf.add_page()
-    
-    pdf.set_font(use_font, 'B', 16)
-    pdf.cell(0, 10, f"GENEL PUAN: {data['score']}/100", 0, 1, 'C')
-    if "Olumlu" in data['decision']: pdf.set_text_color(0, 100, 0)
-    else: pdf.set_text_color(200, 0, 0)
-    safe_decision = data['decision'] if use_font == 'Roboto' else tr_to_en(data['decision'])
-    pdf.cell(0, 10, f"KARAR: {safe_decision}", 0, 1, 'C')
-    pdf.set_text_color(0, 0, 0)
-    pdf.ln(10)
-    
-    pdf.chapter_title("YETKINLIK PUANLARI")
-    pdf.set_font(use_font, '', 12)
-    for cat, val in zip(data['categories'], data['values']):
-        safe_cat = cat if use_font == 'Roboto' else tr_to_en(cat)
-        pdf.cell(100, 8, f"- {safe_cat}", 0, 0)
-        pdf.set_font(use_font, 'B', 12)
-        pdf.cell(0, 8, f"{val}/100", 0, 1)
-        pdf.set_font(use_font, '', 12)
-    pdf.ln(10)
-    
-    pdf.chapter_title("YAPAY ZEKA DEGERLENDIRMESI")
-    pdf.chapter_body(data['text'])
-    
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        pdf.output(tmp_file.name)
-        tmp_file.seek(0)
-        pdf_bytes = tmp_file.read()
-    return pdf_bytes
+def text_to_speech(text, speech_job=None):
+    # Akış sırasında beslenen iş varsa sadece kalan cümleler seslendirilir
+    with metrics.timer("tts_seconds", streamed=speech_job is not None):
+        job = speech_job or get_tts_engine().job()
+        audio = job.finish(text).audio_bytes()
+    if job.failed: st.warning("🔇 Yanıt seslendirilemedi." if not audio else f"🔇 {job.failed} cümle seslendirilemedi.")
+    return audio or None
+
+@st.cache_resource
+def warm_up_fonts():
+    # Fontlar ilk rapordan önce arka planda hazırlanır
+    threading.Thread(target=ensure_fonts, daemon=True).start()
+    return True
 
 def get_pdf_text(pdf_file):
-    text = ""
-    try:
-        reader = PdfReader(pdf_file)
-        for page in reader.pages: text += page.extract_text()
-    except: pass
+    # Çıkarma dosya yüklendiğinde başladı; burada çoğunlukla sadece sonuç alınır
+    with metrics.timer("pdf_text_wait_seconds"):
+        result = prefetch_document(pdf_file).result()
+    name = getattr(pdf_file, "name", "PDF")
+    st.session_state.setdefault("extraction_stats", {})[name] = result
+    if result["error"]: st.warning(f"{name} okunamadı: {result['error']}")
+    elif result["failed"]: st.warning(f"{name}: {len(result['failed'])} sayfa okunamadı (sayfa {', '.join(map(str, result['failed']))}).")
+    return result["text"]
+
+def ask_ai(message, placeholder=None, stream=False, speech_job=None, kind="turn", first_token_callback=None, raw=None):
+    # Akış modunda metin geldikçe placeholder'a yazılır; soru sayacı ilk token ile başlar.
+    # raw verilirse (belge parçaları eklenmiş mesaj) yanıttan sonra geçmişte sadece ham metin kalır.
+    # speech_job verilirse tamamlanan cümleler metin akarken seslendirilmeye başlanır.
+    # Çağrı, API anahtarı başına ortak zamanlayıcıdan (öncelik + 429 geri çekilmesi) geçer.
+    def on_first_token():
+        st.session_state.question_start_time = time.time()
+        if first_token_callback: first_token_callback()
+    def on_text(t):
+        if placeholder is not None and stream: placeholder.markdown(t + "▌")
+        if speech_job is not None: speech_job.feed(t)
+    chat = st.session_state.chat_session
+    history = st.session_state.history if kind == "turn" else None
+    if history: history.before_send(message)
+    text = scheduler.call(api_key_input, lambda: send_message(chat, message, stream=stream, on_first_token=on_first_token, on_text=on_text), kind=kind)
+    if raw is not None and raw != message: drop_context(chat, raw)
+    if history: history.after_turn()
+    if placeholder is not None: placeholder.markdown(text)
     return text
 
+@st.cache_data(max_entries=64)
+def radar_figure(categories, values):
+    # Aynı rapor için şekil her yeniden çalıştırmada tekrar kurulmaz; oturumlar arasında paylaşılan tek bir
+    # değiştirilebilir Figure yerine sözlüğü saklanır (cache_data her çağrıda kopya döndürür)
+    fig = go.Figure(data=go.Scatterpolar(r=list(values), theta=list(categories), fill='toself', name='Aday'))
+    fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 100])), showlegend=False)
+    return fig.to_dict()
+
+def pdf_download_button(data):
+    # PDF içerik hash'iyle önbelleklenir; fragment yeniden çalışsa da bir kez üretilir. Tıklamada (ertelenmiş)
+    # üretim hatayı sadece başarısız indirme olarak gösterdiği için burada üretilip hata kullanıcıya yazılır.
+    try: pdf_bytes = create_pdf_report(data)
+    except Exception as e:
+        st.error(f"PDF Hatası: {e}")
+        return
+    st.download_button(label="📄 Raporu İndir (PDF)", data=pdf_bytes, file_name="mulakat_karnesi.pdf",
+                       mime="application/pdf", on_click="ignore")
+
+def hint_generator(question, kind="hint"):
+    # Arka plan ön-üretimi "prefetch" (en düşük öncelik), butonla istenen ipucu "hint" önceliğiyle gider
+    coach_model = registry.get_model(api_key_input, selected_model_name)
+    hint_prompt = HINT_PROMPT.format(question=question)
+    return lambda: scheduler.call(api_key_input, lambda: coach_model.generate_content(hint_prompt).text, kind=kind)
+
+def open_record(session_id):
+    # Yönetici geçmiş listesinden: anahtarsız açılır (sadece tamamlanmış raporlar)
+    st.query_params.pop("anahtar", None)
+    st.query_params["oturum"] = session_id
+
+def submit_text_answer():
+    # Yazılı cevap tüm sayfayı değil sadece sohbet ve ipucu bölümlerini yeniden çalıştırır
+    st.session_state.pending_answer = st.session_state.chat_text
+    st.rerun(["conversation", "hint"])
+
+def persist_session():
+    # Yeni turlar ve sürdürme için gereken durum kuyruğa eklenir; yazma arka planda toplu yapılır
+    sid = st.session_state.get("session_id")
+    if not sid or not st.session_state.chat_session: return  # açılan tamamlanmış raporlar salt okunur
+    messages = st.session_state.messages
+    start = st.session_state.get("persisted_turns", 0)
+    if len(messages) > start:
+        store.append_turns(sid, start, messages[start:])
+        st.session_state.persisted_turns = len(messages)
+    scorer = st.session_state.scorer
+    state = {"scorer": scorer.snapshot() if scorer else None}
+    if state != st.session_state.get("persisted_state"):
+        store.save_state(sid, state)
+        st.session_state.persisted_state = state
+
+def resume_session(record):
+    # Sohbet geçmişi kayıtlı turlardan yerel olarak kurulur; priming çağrısı olmaz. Kayıttaki mutlak başlangıç
+    # zamanı kullanılmaz: kesinti/sunucu yeniden başlatma süresi adaydan düşmesin diye soru sayacı yeniden başlar.
+    model_name = record["model"]
+    messages = resumable_messages(record["messages"])
+    history = HistoryManager(None, registry.get_model(api_key_input, model_name), scheduler, api_key_input)
+    system_prompt = history.fit_pinned(record["system_prompt"])
+    model = registry.new_model(api_key_input, model_name, safety_settings=SAFETY_SETTINGS, system_instruction=system_prompt)
+    chat = model.start_chat(history=restore_history(messages))
+    history.attach(chat)
+    scorer = AnswerScorer(registry.get_model(api_key_input, model_name, generation_config=JSON_CONFIG), scheduler, api_key_input)
+    if record["state"].get("scorer"): scorer.restore(record["state"]["scorer"])
+    st.session_state.update(
+        session_id=record["id"], jd_hash=record["jd_hash"], chat_session=chat, history=history, scorer=scorer,
+        retriever=get_index(record["documents"]) if record["documents"] else None,
+        messages=messages, persisted_turns=len(messages), report_data=None,
+        question_start_time=time.time() if messages and messages[-1]["role"] == "assistant" else None,
+    )
+
+warm_up_fonts()
+metrics.serve()  # MULAKAT_METRICS_PORT verilmişse yerel /metrics uç noktası
+registry = get_registry()
+scheduler = get_scheduler()
+hint_cache = get_hint_cache()
+store = get_store()
+
 # --- Hafıza ---
 if "messages" not in st.session_state: st.session_state.messages = [] 
 if "chat_session" not in st.session_state: st.session_state.chat_session = None 
@@ -125,6 +161,8 @@ if "report_data" not in st.session_state: st.session_state.report_data = None
 if "fetched_models" not in st.session_state: st.session_state.fetched_models = []
 # [YENİ] Süre takibi için değişken
 if "question_start_time" not in st.session_state: st.session_state.question_start_time = None
+if "scorer" not in st.session_state: st.session_state.scorer = None
+if "history" not in st.session_state: st.session_state.history = None
 
 # --- Sidebar ---
 with st.sidebar:
@@ -138,18 +176,15 @@ with st.sidebar:
     api_key_input = st.text_input("Google API Key", type="password")
     
     if api_key_input:
+        # Liste arka planda çekilir ve tüm oturumlarla paylaşılır; hazırsa butona gerek kalmaz
+        registry.warm_up(api_key_input)
+        cached_models = registry.cached_models(api_key_input)
+        if cached_models: st.session_state.fetched_models = cached_models
         if not st.session_state.fetched_models:
             if st.button("🔄 Modelleri Getir (Bağlan)"):
                 try:
-                    genai.configure(api_key=api_key_input)
-                    models = genai.list_models()
-                    valid_models = []
-                    for m in models:
-                        if 'generateContent' in m.supported_generation_methods:
-                            valid_models.append(m.name)
-                    
+                    valid_models = registry.list_models(api_key_input)
                     if valid_models:
-                        valid_models.sort(key=lambda x: "flash" not in x)
                         st.session_state.fetched_models = valid_models
                         st.success("Modeller yüklendi!")
                     else:
@@ -157,28 +192,103 @@ with st.sidebar:
                 except Exception as e:
                     st.error(f"Bağlantı hatası: {e}")
 
-    options = st.session_state.fetched_models if st.session_state.fetched_models else ["models/gemini-1.5-flash", "gemini-1.5-flash"]
+    options = st.session_state.fetched_models if st.session_state.fetched_models else DEFAULT_MODELS
     selected_model_name = st.selectbox("Kullanılacak Model", options)
+    stream_responses = st.checkbox("⚡ Yanıtları akış halinde göster", value=True)
+    speak_responses = st.checkbox("🔊 Soruları sesli oku", value=True)
+
+    # Dosyalar form dışında: yüklendikleri anda arka planda çıkarılmaya başlar
+    st.info("Mülakat Detayları")
+    cv_file = st.file_uploader("CV (Zorunlu)", type="pdf")
+    portfolio_files = st.file_uploader("Ek Dosyalar", type="pdf", accept_multiple_files=True)
+    for uploaded in [cv_file] + list(portfolio_files or []):
+        if uploaded is not None: prefetch_document(uploaded)
 
     with st.form("main_form"):
-        st.info("Mülakat Detayları")
         job_description = st.text_area("İş İlanı (JD)", height=100)
-        cv_file = st.file_uploader("CV (Zorunlu)", type="pdf")
-        portfolio_files = st.file_uploader("Ek Dosyalar", type="pdf", accept_multiple_files=True)
         start_interview = st.form_submit_button("Mülakatı Başlat")
     
+    if st.session_state.get("extraction_stats"):
+        with st.expander("📄 Belge İşleme Detayları"):
+            for name, result in st.session_state.extraction_stats.items():
+                source = "önbellek" if result["cached"] else f"{result['seconds']:.2f} sn"
+                st.caption(f"**{name}** — {len(result['pages'])} sayfa, {source}")
+                slow = sorted(result["pages"], key=lambda p: p["seconds"], reverse=True)[:3]
+                for p in slow:
+                    status = f"❌ {p['error']}" if p["error"] else f"{p['seconds'] * 1000:.0f} ms"
+                    st.caption(f"• Sayfa {p['page']}: {status}")
+
+    if st.session_state.get("bootstrap_timings"):
+        with st.expander("⏱️ Başlatma Süreleri"):
+            for stage, seconds in st.session_state.bootstrap_timings.items():
+                st.caption(f"• {stage}: {seconds:.2f} sn")
+
+    if st.session_state.get("scorer") and st.session_state.scorer.answers + st.session_state.scorer.pending():
+        st.caption(f"📝 Puanlanan cevap: {st.session_state.scorer.answers} · bekleyen: {st.session_state.scorer.pending()}")
+
+    if st.session_state.get("history"):
+        h = st.session_state.history.stats()
+        st.caption(f"🧮 Geçmiş: ~{h['history_tokens']} token · son tur ~{h['last_turn_tokens']} token · {h['compactions']} özetleme")
+
+    hints = hint_cache.stats()
+    if hints["hits"] + hints["misses"]:
+        st.caption(f"💡 İpucu önbelleği: %{hints['hit_ratio'] * 100:.0f} isabet · {hints['prefetched']} ön-üretim, {hints['prefetch_wasted']} kullanılmadan düştü"
+                   + (f", {hints['prefetch_skipped']} sınır nedeniyle atlandı" if hints['prefetch_skipped'] else ""))
+
+    queue = scheduler.stats()
+    if queue["queue_depth"] or queue["inflight"] or queue["retries"]:
+        st.caption(f"🚦 Kuyruk: {queue['queue_depth']} bekleyen, {queue['inflight']} işlemde · ort. bekleme {queue['avg_wait']:.1f} sn · {queue['retries']} yeniden deneme")
+
+    if IS_ADMIN:
+        # Yönetici paneli: gecikme histogramları (ms), sayaçlar ve bellek; Prometheus metni indirilebilir
+        with st.expander("📈 Ölçümler (yönetici)"):
+            st.caption(f"Süreç belleği: {metrics.process_memory() / 2**20:.0f} MB · bu oturum ~{st.session_state.get('session_bytes', 0) / 1024:.0f} KB")
+            st.dataframe(metrics.summary(), hide_index=True)
+            st.download_button("Prometheus metni", data=metrics.render, file_name="metrics.txt",
+                               mime="text/plain", on_click="ignore")
+            saved = store.stats()
+            st.caption(f"💾 Kayıt: {saved['written']} yazma, {saved['queued']} kuyrukta, {saved['errors']} hata"
+                       + (f" · son hata: {saved['last_error']}" if saved['last_error'] else ""))
+
+    if admin_auth.login_panel():
+        # Tamamlanmış mülakatlar yönetici girişiyle kimlikten (anahtarsız) açılabilir. Bağlantı yerine buton:
+        # sayfa yeniden yüklenmez, giriş bu oturumda kalır.
+        recent = store.recent(limit=10)
+        if recent:
+            with st.expander("📚 Geçmiş Mülakatlar (yönetici)"):
+                for row in recent:
+                    score = "—" if row['score'] is None else f"{row['score']}/100"
+                    label = (f"{row['candidate']} — {score} · {row['decision']} · "
+                             f"{time.strftime('%d.%m.%Y %H:%M', time.localtime(row['created_at']))}")
+                    st.button(label, key=f"gecmis_{row['id']}", type="tertiary", on_click=open_record, args=(row['id'],))
+
     st.markdown("---")
     if st.session_state.get('chat_session'):
         if st.button("🏁 Mülakatı Bitir ve Raporla", type="primary"):
             st.session_state['finish_requested'] = True
 
-# --- Güvenlik ---
-safety_settings = [
-    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
-    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
-    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
-    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
-]
+# --- Oturumu Sürdürme ---
+# Oturum kimliği ve sadece bu tarayıcının bildiği anahtar URL'de tutulur; yenileme ya da sunucu yeniden
+# başlatma sonrası kayıttan geri yüklenir. Anahtarsız açma sadece tamamlanmış raporlar için ve giriş yapmış yöneticiye açıktır.
+resume_id = st.query_params.get("oturum")
+if resume_id and resume_id != st.session_state.get("session_id") and not start_interview:
+    owner = store.check_secret(resume_id, st.query_params.get("anahtar"))
+    record = store.load(resume_id) if owner or admin_auth.is_admin() else None
+    if record is None or not (owner or record["report"]):
+        st.warning("Kayıtlı mülakat bulunamadı.")
+        for param in ("oturum", "anahtar"): st.query_params.pop(param, None)
+    elif record["report"]:
+        st.session_state.update(session_id=resume_id, jd_hash=record["jd_hash"], chat_session=None,
+                                messages=record["messages"], persisted_turns=len(record["messages"]),
+                                report_data=record["report"])
+    elif not api_key_input:
+        st.info("Yarım kalmış bir mülakat bulundu. Kaldığınız yerden devam etmek için API anahtarınızı girin.")
+    else:
+        try:
+            resume_session(record)
+            st.session_state.start_notice = f"Mülakat kaldığı yerden sürdürülüyor. (Model: {record['model']})"
+            st.rerun()
+        except Exception as e: st.error(f"Oturum geri yüklenemedi: {e}")
 
 # --- Mülakat Başlatma ---
 if start_interview:
@@ -186,87 +296,74 @@ if start_interview:
         st.error("Eksik bilgi: API Key veya CV yok.")
     else:
         st.session_state.report_data = None
+        st.session_state.extraction_stats = {}
+        timer = StageTimer()
         
-        genai.configure(api_key=api_key_input)
-        
-        cv_text = get_pdf_text(cv_file)
-        portfolio_text = ""
-        if portfolio_files:
-            for file in portfolio_files:
-                portfolio_text += f"\n--- DOSYA: {file.name} ---\n{get_pdf_text(file)}\n"
+        with timer.stage("belge_cikarma"):
+            cv_text = get_pdf_text(cv_file)
+            portfolio_docs = [(file.name, get_pdf_text(file)) for file in portfolio_files or []]
+        # CV sistem promptunda kalır; portfolyo prompta yığılmaz, indekslenir ve her turda ilgili parçalar eklenir.
+        # İndeks, model ve sohbet hazırlanırken paralel kurulur.
+        index_future = submit(get_index, portfolio_docs) if portfolio_docs else None
+        portfolio_text = portfolio_outline(name for name, _ in portfolio_docs)
         try:
-            system_prompt = f"""
-            === SİSTEM KİMLİĞİ VE AMACI ===
-            SEN, "AI-Powered Senior Talent Assessment Agent" (Yapay Zeka Destekli Kıdemli Yetenek Değerlendirme Uzmanı) OLARAK GÖREV YAPMAKTASIN. 
-            AMACIN: Aşağıda sunulan veri setlerini analiz ederek, aday ile gerçekçi, yetkinlik bazlı ve yapılandırılmış bir teknik mülakat gerçekleştirmektir.
-            
-            === BAĞLAMSAL VERİ SETİ (CONTEXT) ===
-            1. HEDEF POZİSYON (JD): {job_description}
-            2. ADAY PROFİLİ (CV): {cv_text}
-            3. EK DÖKÜMANLAR (PORTFOLYO): {portfolio_text}
-            
-            === YÜRÜTME ALGORİTMASI (EXECUTION PROTOCOL) ===
+            with timer.stage("prompt_ve_model"):
+                # Geçmiş bütçeyi aşınca eski turlar arka planda özetlenir; sistem promptu sabit boyuta sığdırılır
+                st.session_state.history = HistoryManager(None, registry.get_model(api_key_input, selected_model_name), scheduler, api_key_input)
+                system_prompt = st.session_state.history.fit_pinned(build_system_prompt(job_description, cv_text, portfolio_text))
+                # Sistem promptu ayrı bir tur yerine system_instruction olarak gider: açılış tek istekte alınır
+                model = registry.new_model(api_key_input, selected_model_name, safety_settings=SAFETY_SETTINGS, system_instruction=system_prompt)
+                chat = model.start_chat(history=[])
+                st.session_state.history.attach(chat)
+                st.session_state.chat_session = chat
+                scoring_model = registry.get_model(api_key_input, selected_model_name, generation_config=JSON_CONFIG)
+                st.session_state.scorer = AnswerScorer(scoring_model, scheduler, api_key_input)
+            with timer.stage("indeks"):
+                st.session_state.retriever = index_future.result() if index_future else None
             
-            ADIM 1: DİNAMİK ROL ADAPTASYONU (DYNAMIC PERSONA)
-            - İş İlanını (JD) analiz et ve sektörü belirle (Örn: Yazılım, Eğitim, Finans).
-            - İlgili sektöre uygun "Hiring Manager" (İşe Alım Yöneticisi) kimliğine bürün.
-            - Dil ve Ton Ayarı: Sektörel jargon kullan (Örn: Yazılımcı için "Tech Stack", Öğretmen için "Pedagojik Formasyon").
-            
-            ADIM 2: YETKİNLİK SORGULAMA STRATEJİSİ (CBI - Competency Based Interviewing)
-            - Adayın beyanlarını asla yüzeyden kabul etme. "Derinlemesine Sorgulama" (Deep-Dive) yap.
-            - STAR Metodolojisi Entegrasyonu (Implicit Guidance): Adaya doğrudan "STAR kullan" demek yerine, sorularınla onu yönlendir.
-            - Tutarlılık Analizi: CV'deki iddialar ile sohbet sırasındaki cevaplar arasındaki tutarsızlıkları yakala.
-            
-            ADIM 3: SENARYO BAZLI TEST (SITUATIONAL JUDGEMENT)
-            - Adayı teorik bilgiden çıkarıp pratik uygulamaya yönlendir.
-            - Anlık kriz senaryoları üret (Örn: "Sistem çöktü", "Veli şikayet etti") ve çözüm reflekslerini ölç.
-            
-            === KISITLAMALAR VE KURALLAR (CONSTRAINTS) ===
-            1. TEK SORU PRENSİBİ: Bilişsel yükü yönetmek için her seferinde SADECE BİR soru sor.
-            2. OBJEKTİFLİK: Duygusal tepkiler verme, analitik ve profesyonel kal.
-            3. KOPYALA-YAPIŞTIR ENGELİ: Adayın yapay veya ezber cevap verdiğini hissedersen, "Bunu kendi deneyiminle örneklendir" diyerek müdahale et.
-            
-            === BAŞLATMA ===
-            Analizini tamamla, belirlediğin kimliğe bürün, kendini profesyonelce tanıt ve CV/Portfolyo analizine dayalı en kritik ilk sorunu yönelt.
-            """
-            
-            welcome_text = """
-            **👋 Mülakat Simülasyonuna Hoş Geldiniz!**
-
-            Bu mülakat, yapay zeka destekli bir simülasyon üzerinden gerçekleştirilecektir. Amaç, sizi tanımak ve deneyimlerinizi daha iyi anlayabilmektir; stres yaratmak değil.
-
-            ℹ️ **İşleyiş:**
-            * Mülakat sırasında sorulara ister **yazarak** ister **konuşarak** cevap verebilirsiniz.
-            * 🎤 **Mikrofon:** Butona bir kez bastığınızda kayıt başlar, tekrar bastığınızda kayıt durur. Tarayıcınız sesinizi otomatik olarak yazıya çevirecektir.
-            * ⏳ **Süre:** Her bir soru için maksimum 5 dakikalık bir süre bulunmaktadır. **5 dakika içinde cevap vermezseniz sistem mülakatı sonlandıracaktır.**
-            * 💡 **İpucu:** Sorulara kendi deneyimlerinizi yansıtan, samimi ve açık cevaplar vermeniz yeterlidir.
-
-            *Not: Yapay zeka, insan kaynaklarının yerini almaz; yalnızca değerlendirme sürecini destekleyen bir araç olarak kullanılmaktadır.*
-            
-            **Size iyi bir mülakat deneyimi dileriz, başarılar! 🍀**
-            """
-
-            model = genai.GenerativeModel(model_name=selected_model_name, safety_settings=safety_settings)
-            chat = model.start_chat(history=[])
-            st.session_state.chat_session = chat
-            
-            chat.send_message(system_prompt)
-            response = chat.send_message("ANALİZİNİ TAMAMLA VE MÜLAKATI BAŞLAT. Şimdi belirlenen kimliğe bürün, kendini tanıt ve adaya ilk sorunu sor.")
+            with st.chat_message("assistant"):
+                with timer.stage("ilk_soru"):
+                    opening = OPENING_MESSAGE
+                    if st.session_state.retriever:
+                        opening = with_context(OPENING_MESSAGE, st.session_state.retriever.search(job_description))
+                    first_question = ask_ai(opening, st.empty(), stream=stream_responses, kind="priming",
+                                            first_token_callback=lambda: timer.mark("ilk_token"), raw=OPENING_MESSAGE)
+            st.session_state.bootstrap_timings = timer.total()
+            session_id, secret = new_session_id(), new_session_secret()
+            store.create(session_id, cv_file.name, selected_model_name, job_description, system_prompt, portfolio_docs,
+                         secret=secret)
+            st.session_state.update(session_id=session_id, jd_hash=jd_key(job_description), persisted_turns=0,
+                                    persisted_state=None)
+            st.query_params.update(oturum=session_id, anahtar=secret)
             
+            # Sayaç ask_ai içinde ilk token geldiğinde başlatıldı
             st.session_state.messages = [
-                {"role": "assistant", "content": welcome_text},
-                {"role": "assistant", "content": response.text}
+                {"role": "assistant", "content": WELCOME_TEXT},
+                {"role": "assistant", "content": first_question}
             ]
             
-            # [YENİ] Sayacı Başlat (İlk soru için)
-            st.session_state.question_start_time = time.time()
-            
-            st.success(f"Başladı! (Model: {selected_model_name})")
+            st.session_state.start_notice = f"Başladı! (Model: {selected_model_name})"
+            persist_session()
+            st.rerun()
         except Exception as e: st.error(f"Başlatma Hatası: {e}")
 
 # --- Sohbet Akışı ---
-if st.session_state.chat_session:
-    for message in st.session_state.messages:
+# Sohbet, ipucu paneli ve rapor ayrı fragment'lerde çalışır: bir etkileşim sadece ilgili bölümü yeniden
+# çalıştırır. Yazılı cevap, metin kutusunun callback'i ile sadece sohbet ve ipucu bölümlerini tetikler.
+if st.session_state.get("start_notice"):
+    st.success(st.session_state.pop("start_notice"))
+if st.session_state.get("session_id") and store.write_failed(st.session_state.session_id):
+    st.warning("⚠️ Mülakat kaydının bir kısmı diske yazılamadı; sayfa yenilenirse kaldığınız yerden devam edilemeyebilir.")
+
+@st.fragment(key="conversation")
+@metrics.timed("script_run_seconds", scope="conversation")
+def conversation():
+    messages = st.session_state.messages
+    # Eski mesajlar varsayılan olarak çizilmez; yeniden çalıştırma maliyeti döküm uzunluğundan bağımsız kalır
+    hidden = max(0, len(messages) - MESSAGE_WINDOW)
+    if hidden and not st.toggle(f"Önceki {hidden} mesajı göster", key="show_older"):
+        messages = messages[hidden:]
+    for message in messages:
         role = "user" if message["role"] == "user" else "assistant"
         with st.chat_message(role):
             st.write(message["content"])
@@ -274,21 +371,13 @@ if st.session_state.chat_session:
     if st.session_state.messages and st.session_state.messages[-1]["role"] == "assistant":
         # Süre uyarısını göster
         st.caption("⏳ Bu soruya cevap vermek için 5 dakikanız var.")
-        
-        with st.expander("💡 Takıldınız mı? İpucu Alın"):
-            if st.button("AI Koçundan Yardım İste"):
-                with st.spinner("Koç soruyu analiz ediyor..."):
-                    try:
-                        coach_model = genai.GenerativeModel(selected_model_name)
-                        last_question = st.session_state.messages[-1]["content"]
-                        hint_prompt = f"Adaya şu soru için cevabı söylemeden bir ipucu ver: {last_question}"
-                        hint_response = coach_model.generate_content(hint_prompt)
-                        st.info(f"🔑 **İpucu:** {hint_response.text}")
-                    except: st.warning("İpucu alınamadı.")
+        # İpucu soru ekrana gelir gelmez arka planda hazırlanır (önbellekte varsa hiç istek atılmaz)
+        last_question = st.session_state.messages[-1]["content"]
+        hint_cache.prefetch(last_question, hint_generator(last_question, "prefetch"))
 
     col_mic, col_text = st.columns([1, 5])
     
-    user_input = None
+    user_input = st.session_state.pop("pending_answer", None)
     
     with col_mic:
         st.write("Cevabını Konuş:")
@@ -304,129 +393,128 @@ if st.session_state.chat_session:
         user_input = text_from_mic
         st.info(f"🎤 Algılanan: {user_input}")
 
-    text_input = st.chat_input("Veya yazarak cevapla...")
-    if text_input: user_input = text_input
-
     # --- SÜRE KONTROLÜ VE CEVAP İŞLEME ---
     if user_input:
         # 1. Süreyi Kontrol Et
         current_time = time.time()
         # Eğer start_time yoksa (örn. sayfa yeni açıldıysa) şimdiki zamanı alıp geç
-        start_time = st.session_state.get('question_start_time', current_time) 
+        start_time = st.session_state.get('question_start_time') or current_time
         elapsed_time = current_time - start_time
         time_limit = 300  # 5 dakika = 300 saniye
 
         if elapsed_time > time_limit:
             # SÜRE DOLDUYSA
             st.error(f"⚠️ Süre Doldu! (Geçen süre: {int(elapsed_time/60)} dakika). Mülakat sonlandırılıyor.")
-            st.session_state.messages.append({"role": "user", "content": "Süre doldu, cevap veremedim."}) # Loglara düşsün
+            st.session_state.scorer.submit(st.session_state.messages[-1]["content"], TIMEOUT_ANSWER)
+            st.session_state.messages.append({"role": "user", "content": TIMEOUT_ANSWER}) # Loglara düşsün
             st.session_state.finish_requested = True
+            persist_session()
             st.rerun()
         else:
             # SÜRE İÇİNDEYSE -> İşleme Devam Et
+            question = st.session_state.messages[-1]["content"]
             st.session_state.messages.append({"role": "user", "content": user_input})
-            if text_input:
+            if not text_from_mic:
                 with st.chat_message("user"): st.write(user_input)
 
-            with st.spinner("Yapay Zeka düşünüyor..."):
-                try:
-                    if st.session_state.messages[-1]["role"] != "assistant":
-                        response = st.session_state.chat_session.send_message(user_input)
-                        ai_text = response.text
+            try:
+                if st.session_state.messages[-1]["role"] != "assistant":
+                    with st.chat_message("assistant"):
+                        placeholder = st.empty()
+                        speech_job = get_tts_engine().job() if speak_responses else None
+                        message = user_input
+                        if st.session_state.get("retriever"):
+                            message = with_context(user_input, st.session_state.retriever.search(user_input))
+                        if stream_responses:
+                            ai_text = ask_ai(message, placeholder, stream=True, speech_job=speech_job, raw=user_input)
+                        else:
+                            with st.spinner("Yapay Zeka düşünüyor..."):
+                                ai_text = ask_ai(message, placeholder, raw=user_input)
+                        # YENİ SORU İÇİN sayaç ask_ai içinde (ilk token ile) sıfırlandı
+                        # Cevap, sohbet sürerken arka planda puanlanır
+                        st.session_state.scorer.submit(question, user_input)
                         st.session_state.messages.append({"role": "assistant", "content": ai_text})
+                        hint_cache.prefetch(ai_text, hint_generator(ai_text, "prefetch"))
                         
-                        # [YENİ] Yapay zeka cevap verince, YENİ SORU İÇİN sayacı sıfırla
-                        st.session_state.question_start_time = time.time()
-                        
-                        with st.chat_message("assistant"):
-                            st.write(ai_text)
-                            audio_path = text_to_speech(ai_text)
-                            if audio_path: st.audio(audio_path, format="audio/mp3", autoplay=True)
-                except Exception as e: st.error(f"Hata: {e}")
+                        if speak_responses:
+                            audio = text_to_speech(ai_text, speech_job)
+                            if audio: st.audio(audio, format="audio/mp3", autoplay=True)
+            except Exception as e:
+                # Yanıt alınamadıysa tur sohbetten geri alındı (llm.send_message); cevap tekrar gönderilebilir
+                # ve aday modelin hatası yüzünden süre kaybetmesin diye sayaç yeniden başlar
+                if st.session_state.messages[-1]["role"] == "user": st.session_state.messages.pop()
+                st.session_state.question_start_time = time.time()
+                st.error(f"Hata: {e}")
+            persist_session()
+
+@st.fragment(key="hint")
+@metrics.timed("script_run_seconds", scope="hint")
+def hint_panel():
+    # Soru, butona basıldığı anda oturumdan okunur; sohbet ilerlese de panelin yeniden çizilmesi gerekmez
+    with st.expander("💡 Takıldınız mı? İpucu Alın"):
+        if st.button("AI Koçundan Yardım İste"):
+            messages = st.session_state.messages
+            if not messages or messages[-1]["role"] != "assistant": return
+            last_question = messages[-1]["content"]
+            with st.spinner("Koç soruyu analiz ediyor..."):
+                try:
+                    hint_text = hint_cache.get(last_question, hint_generator(last_question))
+                    st.info(f"🔑 **İpucu:** {hint_text}")
+                except Exception: st.warning("İpucu alınamadı.")
+
+if st.session_state.chat_session:
+    conversation()
+    hint_panel()
+    st.chat_input("Veya yazarak cevapla...", key="chat_text", on_submit=submit_text_answer)
 
 # --- Raporlama ---
 if st.session_state.finish_requested and st.session_state.chat_session:
-    with st.spinner("Mülakat bitti, analiz yapılıyor..."):
-        max_retries = 3
-        retry_count = 0
-        success = False
-        
-        while retry_count < max_retries and not success:
-            try:
-                report_prompt = """
-                MÜLAKAT BİTTİ. Detaylı analiz yap.
-                🚨 KURAL: EĞER ADAY CEVAP VERMEDİYSE VEYA SÜRE DOLDUYSA PUAN 0 OLSUN.
-                FORMAT:
-                SKOR: (0-100 arası sadece sayı)
-                KARAR: (Olumlu / Olumsuz)
-                -- PUAN DETAYLARI --
-                TEKNİK: (0-100)
-                İLETİŞİM: (0-100)
-                PROBLEM_ÇÖZME: (0-100)
-                TEORİK_BİLGİ: (0-100)
-                POTANSİYEL: (0-100)
-                -- SÖZEL RAPOR --
-                (Kısa bir özet yaz)
-                """
-                response = st.session_state.chat_session.send_message(report_prompt)
-                full_text = response.text
-                success = True
-            except Exception as e:
-                if "429" in str(e):
-                    retry_count += 1
-                    time.sleep(10)
-                else: break
-
-        if success:
-            score = 0
-            decision = "Belirsiz"
-            
-            score_match = re.search(r"SKOR[:\s*]*(\d+)", full_text, re.IGNORECASE)
-            if score_match: score = int(score_match.group(1))
-            
-            decision_match = re.search(r"KARAR[:\s*]*(.+)", full_text, re.IGNORECASE)
-            if decision_match: decision = decision_match.group(1).strip()
-
-            categories = ["TEKNİK", "İLETİŞİM", "PROBLEM_ÇÖZME", "TEORİK_BİLGİ", "POTANSİYEL"]
-            values = []
-            for cat in categories:
-                cat_match = re.search(rf"{cat}[:\s*]*(\d+)", full_text, re.IGNORECASE)
-                if cat_match: values.append(int(cat_match.group(1)))
-                else: values.append(50)
-            
-            try: verbal_report = full_text.split("-- SÖZEL RAPOR --")[1]
-            except: verbal_report = full_text
-
-            st.session_state.report_data = {
-                "score": score,
-                "decision": decision,
-                "categories": categories,
-                "values": values,
-                "text": verbal_report
-            }
+    # Cevaplar zaten puanlandı; burada sadece bekleyenler tamamlanır, puanlar birleştirilir ve kısa özet alınır
+    with st.spinner("Mülakat bitti, puanlar birleştiriliyor..."):
+        try:
+            st.session_state.report_data = st.session_state.scorer.finish()
             st.session_state.finish_requested = False
+            persist_session()
+            if st.session_state.get("session_id"): store.finish(st.session_state.session_id, st.session_state.report_data)
             st.rerun()
-        else:
-            st.error("Rapor oluşturulamadı.")
+        except Exception as e:
+            st.error(f"Rapor oluşturulamadı: {e}")
 
 # --- EKRAN: Rapor ve PDF ---
-if st.session_state.report_data:
-    data = st.session_state.report_data
+@st.fragment(key="report")
+@metrics.timed("script_run_seconds", scope="report")
+def report_view(data):
     st.markdown("---")
     st.header("📊 Mülakat Sonuç Karnesi")
     c1, c2 = st.columns(2)
-    c1.metric("Genel Puan", f"{data['score']}/100")
+    scored = data['score'] is not None
+    c1.metric("Genel Puan", f"{data['score']}/100" if scored else "—")
     if "Olumlu" in data['decision']: c2.success(f"Karar: {data['decision']}")
-    else: c2.error(f"Karar: {data['decision']}")
-    st.progress(data['score'])
+    elif scored: c2.error(f"Karar: {data['decision']}")
+    else: c2.warning(f"Karar: {data['decision']}")
+    if scored: st.progress(data['score'])
+    if data.get('failed'):
+        st.warning(f"⚠️ Eksik değerlendirme: {data.get('scored', 0)} cevap puanlandı, {data['failed']} cevap puanlanamadı "
+                   f"(hata ya da süre aşımı). Puan sadece puanlanan cevaplara dayanır.")
+    if scored and data.get('missing'): st.caption(f"⚠️ Yeterli veri olmadığı için tahmini puanlanan kategoriler: {', '.join(data['missing'])}")
+    if scored and st.session_state.get("jd_hash"):
+        past = store.summary(st.session_state.jd_hash, data['score'])
+        if past["count"] > 1:
+            st.caption(f"📚 Bu ilan için {past['count']} mülakat · ortalama {past['avg_score']:.0f} · "
+                       f"{past['passed']} olumlu · bu aday adayların %{past['percentile'] * 100:.0f}'inden yüksek puan aldı")
     col_chart, col_text = st.columns([1, 1])
     with col_chart:
-        fig = go.Figure(data=go.Scatterpolar(r=data['values'], theta=data['categories'], fill='toself', name='Aday'))
-        fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 100])), showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(radar_figure(tuple(data['categories']), tuple(data['values'])), width="stretch")
     with col_text:
         st.info(data['text'])
-        try:
-            pdf_bytes = create_pdf_report(data)
-            st.download_button(label="📄 Raporu İndir (PDF)", data=pdf_bytes, file_name="mulakat_karnesi.pdf", mime="application/pdf")
-        except Exception as e: st.error(f"PDF Hatası: {e}")
+        # İndirme yeniden çalıştırma tetiklemez
+        pdf_download_button(data)
+
+if st.session_state.report_data:
+    report_view(st.session_state.report_data)
+
+persist_session()
+# Oturum başına bellek ve tam betik çalıştırma süresi (fragment çalıştırmaları ayrıca ölçülür)
+st.session_state.session_bytes = metrics.approx_size(dict(st.session_state))
+metrics.observe("session_state_bytes", st.session_state.session_bytes, buckets=metrics.SIZE_BUCKETS)
+metrics.observe("script_run_seconds", time.perf_counter() - script_started, scope="app")
@@ -0,0 +1,77 @@
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+import admin_auth
+import metrics
+from interview_core import CATEGORIES
+from ranking import PERCENTILES, get_table
+from session_store import get_store
+
+# --- Aday Sıralama Paneli ---
+# Aynı ilana ait tüm mülakat ve toplu tarama sonuçları ağırlıklı olarak sıralanır. Yüzdelik bantlar ve
+# seçilen adayların radarları üst üste gösterilir. Ağırlık değişiklikleri sadece sıralama bölümünü yeniden çalıştırır.
+# Tüm adayların ad, puan ve kararlarını gösterdiği için sadece yönetici girişi yapılmış oturumda açılır (admin_auth).
+st.set_page_config(page_title="Aday Sıralama", layout="wide")
+st.title("👥 Aday Sıralama")
+
+if not admin_auth.is_admin():
+    st.error("Bu sayfa sadece yönetici girişi yapıldıktan sonra görüntülenebilir.")
+    admin_auth.login_panel()
+    st.stop()
+
+table = get_table()
+table.refresh(get_store())
+jds = table.jd_list()
+if not jds:
+    st.info("Henüz tamamlanmış mülakat yok. Toplu tarama sonuçlarını eklemek için: python batch_screen.py ... --store")
+    st.stop()
+
+def jd_label(jd_hash):
+    columns = table.jds[jd_hash]
+    lines = (columns.title or "").strip().splitlines()
+    return f"{lines[0][:60] if lines else jd_hash} ({len(columns)} aday)"
+
+jd_hash = st.selectbox("İş İlanı", [h for h, _, _ in jds], format_func=jd_label)
+columns = table.jds[jd_hash]
+
+c1, c2, c3 = st.columns(3)
+c1.metric("Aday", len(columns))
+c2.metric("Olumlu", f"%{columns.passed.mean() * 100:.0f}")
+c3.metric("Medyan Puan", f"{np.median(columns.scores):.0f}")
+
+@st.fragment(key="ranking")
+@metrics.timed("script_run_seconds", scope="ranking")
+def ranking_view(columns):
+    st.caption("Kategori ağırlıkları")
+    weight_cols = st.columns(len(CATEGORIES))
+    weights = [col.slider(cat, 0.0, 5.0, 1.0, 0.5, key=f"w_{cat}") for col, cat in zip(weight_cols, CATEGORIES)]
+    k = st.number_input("Gösterilecek aday (top-k)", min_value=1, max_value=len(columns), value=min(20, len(columns)))
+
+    rows = columns.rank(weights, int(k))
+    st.dataframe(rows, hide_index=True, column_config={"id": None}, width="stretch")
+
+    col_bands, col_chart = st.columns([1, 1])
+    with col_bands:
+        st.subheader("Yüzdelik Bantlar")
+        per_category = columns.category_percentiles()
+        weighted = np.percentile(columns.weighted(weights), PERCENTILES)
+        st.dataframe([{"yüzdelik": f"P{q}", **{cat: round(float(v)) for cat, v in zip(CATEGORIES, per_category[i])},
+                       "ağırlıklı": round(float(weighted[i]), 1)} for i, q in enumerate(PERCENTILES)],
+                     hide_index=True, width="stretch")
+    with col_chart:
+        names = {row["id"]: f"{row['sıra']}. {row['aday']}" for row in rows}
+        selected = st.multiselect("Karşılaştırılacak adaylar", list(names), default=list(names)[:3], format_func=names.get)
+        theta = CATEGORIES + CATEGORIES[:1]
+        fig = go.Figure()
+        # Gri çizgiler bu ilandaki tüm adayların P25 / medyan / P75 profilidir
+        quartiles = columns.category_percentiles((25, 50, 75))
+        for values, name, dash in ((quartiles[2], "P75", "dot"), (quartiles[1], "Medyan", "dash"), (quartiles[0], "P25", "dot")):
+            fig.add_trace(go.Scatterpolar(r=list(values) + [values[0]], theta=theta, name=name, line=dict(color="gray", dash=dash)))
+        for session_id in selected:
+            name, values = columns.profile(session_id)
+            fig.add_trace(go.Scatterpolar(r=list(values) + [values[0]], theta=theta, fill="toself", opacity=0.5, name=name))
+        fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 100])))
+        st.plotly_chart(fig, width="stretch")
+
+ranking_view(columns)
@@ -0,0 +1,127 @@
+import io
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from pypdf import PdfReader
+
+import metrics
+from disk_cache import DiskCache, content_hash
+
+# --- PDF Metin Çıkarma ---
+# Aynı CV farklı JD'lerle tekrar tekrar taranıyor; sonuç dosya baytlarının hash'i ile diskte saklanır.
+# Büyük dosyalar (PARALLEL_MIN_PAGES ve üstü) sayfa aralıklarına bölünüp süreç havuzunda işlenir.
+PARALLEL_MIN_PAGES = 16
+MAX_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+_cache = DiskCache("pdf_text", max_bytes=128 * 1024 * 1024, suffix=".json")
+_pool = None
+_pool_lock = threading.Lock()
+log = logging.getLogger(__name__)
+
+
+def read_source(source):
+    # Streamlit UploadedFile, dosya yolu, bayt veya açık dosya kabul edilir
+    if isinstance(source, (bytes, bytearray)): return bytes(source)
+    if hasattr(source, "getvalue"): return source.getvalue()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f: return f.read()
+    return source.read()
+
+
+def _extract_pages(reader, start, stop):
+    pages = []
+    for i in range(start, stop):
+        t0 = time.perf_counter()
+        try:
+            text, error = reader.pages[i].extract_text() or "", None
+        except Exception as e:
+            text, error = "", f"{type(e).__name__}: {e}"
+        pages.append({"page": i + 1, "text": text, "seconds": time.perf_counter() - t0, "error": error})
+    return pages
+
+
+def _extract_range(data, start, stop):
+    return _extract_pages(PdfReader(io.BytesIO(data)), start, stop)
+
+
+def _get_pool():
+    global _pool
+    # fork yerine spawn: çok iş parçacıklı Streamlit sunucusu kopyalanmaz (kilitler yarım kalabilir).
+    # Kilit, aynı anda yüklenen iki büyük dosyanın iki ayrı havuz açmasını önler.
+    with _pool_lock:
+        if _pool is None: _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _discard_pool(pool):
+    # Bozulan havuz kapatılır (süreçleri ve yönetici iş parçacığı sızmasın); bir sonraki çağrı yenisini açar
+    global _pool
+    with _pool_lock:
+        if _pool is pool: _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_parallel(data, page_count):
+    step = -(-page_count // MAX_WORKERS)
+    ranges = [(s, min(s + step, page_count)) for s in range(0, page_count, step)]
+    pool = _get_pool()
+    try:
+        futures = [pool.submit(_extract_range, data, s, e) for s, e in ranges]
+        return [page for f in futures for page in f.result()]
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        return None
+
+
+def extract_pdf(source, parallel_min_pages=PARALLEL_MIN_PAGES):
+    with metrics.timer("pdf_extract_seconds", cache="hit") as labels:
+        result = _extract_pdf(source, parallel_min_pages)
+        if not result["cached"]:
+            labels["cache"] = "miss"
+            metrics.inc("pdf_pages_total", len(result["pages"]))
+        return result
+
+
+def _extract_pdf(source, parallel_min_pages):
+    data = read_source(source)
+    key = content_hash(data)
+    cached = _cache.get(key)
+    if cached is not None:
+        try:
+            result = json.loads(cached)
+            result["cached"] = True
+            return result
+        except ValueError: pass
+
+    t0 = time.perf_counter()
+    result = {"hash": key, "text": "", "pages": [], "failed": [], "error": None, "seconds": 0.0, "cached": False}
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        page_count = len(reader.pages)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["seconds"] = time.perf_counter() - t0
+        return result
+
+    pages = None
+    if page_count >= parallel_min_pages and MAX_WORKERS > 1:
+        pages = _extract_parallel(data, page_count)
+    if pages is None:
+        pages = _extract_pages(reader, 0, page_count)
+
+    result["text"] = "\n".join(p["text"] for p in pages)
+    result["pages"] = [{k: v for k, v in p.items() if k != "text"} for p in pages]
+    result["failed"] = [p["page"] for p in pages if p["error"]]
+    result["seconds"] = time.perf_counter() - t0
+    # Hatalı sayfa varsa önbelleğe yazma; bir sonraki yüklemede yeniden denensin
+    # Disk dolu/izin hatası sonucu kaybettirmez; sadece önbelleğe alınmaz
+    if not result["failed"]:
+        try: _cache.put(key, json.dumps(result).encode("utf-8"))
+        except OSError as e: log.warning("PDF metni önbelleğe yazılamadı: %s", e)
+    return result
@@ -0,0 +1,168 @@
+import json
+import threading
+
+import numpy as np
+
+import metrics
+from interview_core import CATEGORIES
+
+# --- Aday Sıralama ---
+# Tamamlanan raporlar ilan (JD) bazında sütunlu tutulur: kategori puanları (n x 5 float32), genel puan,
+# karar ve kimlikler ayrı dizilerdir. Ağırlıklı sıralama tek matris-vektör çarpımı, top-k argpartition,
+# yüzdelik bantlar searchsorted ile hesaplanır; 10 bin aday milisaniyeler içinde sıralanır.
+# Kayıtlar oturum deposundan artımlı okunur: her yenilemede sadece son okumadan sonra bitenler eklenir.
+PERCENTILES = (10, 25, 50, 75, 90)
+BANDS = ((0.9, "Üst %10"), (0.75, "Üst %25"), (0.5, "Üst %50"), (0.25, "Alt %50"))
+LOWEST_BAND = "Alt %25"
+
+
+class JDColumns:
+    def __init__(self, jd_hash, title="", lock=None):
+        # lock: tablonun kilidi; yenileme eklerken başka oturumların sorguları _pending'i boşaltamaz
+        self.jd_hash = jd_hash
+        self.title = title
+        self._lock = lock or threading.RLock()
+        self.ids = []
+        self.candidates = []
+        self._positions = {}
+        self._pending = []
+        self._percentiles = {}
+        self._values = np.zeros((0, len(CATEGORIES)), dtype=np.float32)
+        self._scores = np.zeros(0, dtype=np.float32)
+        self._passed = np.zeros(0, dtype=bool)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, session_id, candidate, values, score, passed):
+        with self._lock:
+            self._positions[session_id] = len(self.ids)
+            self.ids.append(session_id)
+            self.candidates.append(candidate)
+            self._pending.append((values, score, passed))
+
+    def _compact(self):
+        # Eklemeler listede biriktirilir, ilk sorguda dizilere tek seferde eklenir
+        with self._lock:
+            if not self._pending: return
+            values, scores, passed = zip(*self._pending)
+            self._values = np.concatenate([self._values, np.asarray(values, dtype=np.float32)])
+            self._scores = np.concatenate([self._scores, np.asarray(scores, dtype=np.float32)])
+            self._passed = np.concatenate([self._passed, np.asarray(passed, dtype=bool)])
+            self._pending = []
+            self._percentiles = {}
+
+    @property
+    def values(self):
+        self._compact()
+        return self._values
+
+    @property
+    def scores(self):
+        self._compact()
+        return self._scores
+
+    @property
+    def passed(self):
+        self._compact()
+        return self._passed
+
+    def weighted(self, weights):
+        # Ağırlıklar normalize edilir; hepsi sıfırsa eşit ağırlık
+        w = np.asarray(weights, dtype=np.float32)
+        w = w / w.sum() if w.sum() > 0 else np.full(len(CATEGORIES), 1 / len(CATEGORIES), dtype=np.float32)
+        return self.values @ w
+
+    def top_k(self, weights, k=20):
+        scores = self.weighted(weights)
+        k = min(k, len(scores))
+        if k == 0: return np.zeros(0, dtype=np.int64), scores
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top], kind="stable")], scores
+
+    @staticmethod
+    def percentile_ranks(scores):
+        # Yüzdelik sıra (0-1): altında kalanlar + eşitlerin yarısı; eşit puanlılar aynı banda düşer
+        ordered = np.sort(scores)
+        below = np.searchsorted(ordered, scores, side="left")
+        equal_or_below = np.searchsorted(ordered, scores, side="right")
+        return (below + equal_or_below) / (2 * max(len(scores), 1))
+
+    @staticmethod
+    def bands(ranks):
+        return np.select([ranks >= limit for limit, _ in BANDS], [label for _, label in BANDS], LOWEST_BAND)
+
+    def category_percentiles(self, q=PERCENTILES):
+        # (len(q), kategori) matrisi; yeni kayıt gelene kadar saklanır (ağırlık değişimi etkilemez)
+        if not len(self): return np.zeros((len(q), len(CATEGORIES)), dtype=np.float32)
+        values = self.values
+        q = tuple(q)
+        if q not in self._percentiles: self._percentiles[q] = np.percentile(values, q, axis=0)
+        return self._percentiles[q]
+
+    def rank(self, weights, k=20):
+        with metrics.timer("ranking_seconds", op="rank"):
+            top, scores = self.top_k(weights, k)
+            ranks = self.percentile_ranks(scores)[top]
+            bands = self.bands(ranks)
+            return [{
+                "sıra": i + 1,
+                "aday": self.candidates[j],
+                "ağırlıklı": round(float(scores[j]), 1),
+                "genel": int(self.scores[j]),
+                "karar": "Olumlu" if self.passed[j] else "Olumsuz",
+                "yüzdelik": round(float(ranks[i]) * 100),
+                "bant": str(bands[i]),
+                **{cat: int(v) for cat, v in zip(CATEGORIES, self.values[j])},
+                "id": self.ids[j],
+            } for i, j in enumerate(top)]
+
+    def profile(self, session_id):
+        index = self._positions[session_id]
+        return self.candidates[index], self.values[index]
+
+
+class ReportTable:
+    def __init__(self):
+        self.jds = {}
+        self._seen = set()
+        self._watermark = 0  # okunan son finish_seq
+        self._lock = threading.RLock()
+
+    def add(self, session_id, candidate, jd_hash, report, title=""):
+        values = report.get("values") or []
+        # Hiç puanlanamamış (score=None) ya da hiçbir kategorisi ölçülememiş (değerleri yer tutucu) raporlar sıralamaya girmez
+        if session_id in self._seen or len(values) != len(CATEGORIES) or report.get("score") is None: return False
+        if set(CATEGORIES) <= set(report.get("missing") or []): return False
+        self._seen.add(session_id)
+        columns = self.jds.get(jd_hash)
+        if columns is None: columns = self.jds[jd_hash] = JDColumns(jd_hash, title, self._lock)
+        columns.append(session_id, candidate, values, report.get("score", 0),
+                       "Olumlu" in str(report.get("decision", "")))
+        return True
+
+    def refresh(self, store):
+        # Sadece son yenilemeden sonra tamamlanan raporlar okunur; finish_seq commit sırasıyla arttığı için
+        # geç commit edilen bir rapor atlanmaz (yeniden tamamlanan oturumlar _seen ile elenir)
+        with self._lock, metrics.timer("ranking_seconds", op="refresh"):
+            added = 0
+            for row in store.finished_reports(after=self._watermark):
+                self._watermark = max(self._watermark, row["finish_seq"])
+                try: report = json.loads(row["report"])
+                except (TypeError, ValueError): continue
+                added += self.add(row["id"], row["candidate"], row["jd_hash"], report, row["title"])
+            return added
+
+    def jd_list(self):
+        return sorted(((c.jd_hash, c.title, len(c)) for c in self.jds.values()), key=lambda x: -x[2])
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def get_table():
+    global _table
+    with _table_lock:
+        if _table is None: _table = ReportTable()
+    return _table
@@ -0,0 +1,161 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+from fpdf import FPDF
+
+import metrics
+from disk_cache import content_hash
+
+# --- PDF Rapor Motoru ---
+# Fontlar süreç başına bir kez indirilip seçilir, PDF bellekte üretilir (geçici dosya yok)
+# ve çıktı report_data hash'i ile bellekte saklanır; aynı rapor için yeniden çizim yapılmaz.
+FONT_DIR = os.environ.get("MULAKAT_FONT_DIR", os.path.dirname(os.path.abspath(__file__)))
+FONTS = {
+    "Roboto-Regular.ttf": "https://github.com/google/fonts/raw/main/apache/roboto/Roboto-Regular.ttf",
+    "Roboto-Bold.ttf": "https://github.com/google/fonts/raw/main/apache/roboto/Roboto-Bold.ttf"
+}
+MEMO_SIZE = 64
+FONT_RETRY_SECONDS = 300
+
+_font_lock = threading.Lock()
+_use_font = None
+_font_retry_at = 0.0
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def check_and_download_fonts():
+    for font_name, url in FONTS.items():
+        path = os.path.join(FONT_DIR, font_name)
+        if not os.path.exists(path):
+            with metrics.timer("font_download_seconds", font=font_name) as labels:
+                try:
+                    response = requests.get(url, timeout=5)
+                    labels["status"] = response.status_code
+                    if response.status_code == 200:
+                        with open(path, 'wb') as f:
+                            f.write(response.content)
+                except requests.RequestException: labels["status"] = "error"
+
+
+def ensure_fonts():
+    # Fontlar hazırsa sonuç saklanır ve sonraki çağrılar sadece okur. İndirme başarısızsa Arial kullanılır,
+    # ama bu kalıcı değildir: FONT_RETRY_SECONDS sonra yeniden denenir (her raporda ağ beklenmez).
+    global _use_font, _font_retry_at
+    if _use_font is not None: return _use_font
+    if time.monotonic() < _font_retry_at: return 'Arial'
+    with _font_lock:
+        if _use_font is None and time.monotonic() >= _font_retry_at:
+            check_and_download_fonts()
+            if all(os.path.exists(os.path.join(FONT_DIR, name)) for name in FONTS): _use_font = 'Roboto'
+            else: _font_retry_at = time.monotonic() + FONT_RETRY_SECONDS
+    return _use_font or 'Arial'
+
+
+def tr_to_en(text):
+    if not text: return ""
+    tr_map = {'ğ':'g','Ğ':'G','ş':'s','Ş':'S','ı':'i','İ':'I','ç':'c','Ç':'C','ü':'u','Ü':'U','ö':'o','Ö':'O'}
+    for tr, en in tr_map.items(): text = text.replace(tr, en)
+    return text
+
+
+class ReportPDF(FPDF):
+    def __init__(self, use_font):
+        super().__init__()
+        self.use_font = use_font
+        if use_font == 'Roboto':
+            self.add_font('Roboto', 'B', os.path.join(FONT_DIR, 'Roboto-Bold.ttf'), uni=True)
+            self.add_font('Roboto', '', os.path.join(FONT_DIR, 'Roboto-Regular.ttf'), uni=True)
+
+    def safe(self, text):
+        if self.use_font == 'Roboto': return text
+        return tr_to_en(text).encode('latin-1', 'ignore').decode('latin-1')
+
+    def header(self):
+        self.set_font(self.use_font, 'B', 20)
+        self.cell(0, 10, 'AI MULAKAT SONUC RAPORU', 0, 1, 'C')
+        self.ln(10)
+
+    def chapter_title(self, title):
+        self.set_font(self.use_font, 'B', 14)
+        self.set_fill_color(230, 230, 230)
+        self.cell(0, 10, self.safe(title), 0, 1, 'L', fill=True)
+        self.ln(4)
+
+    def chapter_body(self, body):
+        self.set_font(self.use_font, '', 11)
+        self.multi_cell(0, 6, self.safe(body))
+        self.ln(5)
+
+
+def render_pdf(data, use_font=None):
+    use_font = use_font or ensure_fonts()
+    try: pdf = ReportPDF(use_font)
+    except (OSError, RuntimeError): pdf = ReportPDF('Arial')
+    pdf.add_page()
+
+    pdf.set_font(pdf.use_font, 'B', 16)
+    pdf.cell(0, 10, f"GENEL PUAN: {'-' if data['score'] is None else data['score']}/100", 0, 1, 'C')
+    if "Olumlu" in data['decision']: pdf.set_text_color(0, 100, 0)
+    else: pdf.set_text_color(200, 0, 0)
+    pdf.cell(0, 10, f"KARAR: {pdf.safe(data['decision'])}", 0, 1, 'C')
+    pdf.set_text_color(0, 0, 0)
+    pdf.ln(10)
+
+    pdf.chapter_title("YETKINLIK PUANLARI")
+    pdf.set_font(pdf.use_font, '', 12)
+    for cat, val in zip(data['categories'], data['values']):
+        pdf.cell(100, 8, f"- {pdf.safe(cat)}", 0, 0)
+        pdf.set_font(pdf.use_font, 'B', 12)
+        pdf.cell(0, 8, f"{val}/100", 0, 1)
+        pdf.set_font(pdf.use_font, '', 12)
+    pdf.ln(10)
+
+    pdf.chapter_title("YAPAY ZEKA DEGERLENDIRMESI")
+    pdf.chapter_body(data['text'])
+
+    # pyfpdf 1.7 str (latin-1), fpdf2 bytearray döndürür
+    out = pdf.output(dest='S')
+    if isinstance(out, str): out = out.encode('latin-1')
+    return bytes(out)
+
+
+def report_key(data):
+    return content_hash(json.dumps(data, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def create_pdf_report(data):
+    with metrics.timer("pdf_report_seconds", cache="hit") as labels:
+        # Font anahtara dahil: indirme sonradan başarılı olursa Arial ile çizilmiş kopya tekrar verilmez
+        use_font = ensure_fonts()
+        key = (use_font, report_key(data))
+        with _memo_lock:
+            if key in _memo:
+                _memo.move_to_end(key)
+                return _memo[key]
+        labels["cache"] = "miss"
+        pdf_bytes = render_pdf(data, use_font)
+        with _memo_lock:
+            _memo[key] = pdf_bytes
+            if len(_memo) > MEMO_SIZE: _memo.popitem(last=False)
+        return pdf_bytes
+
+
+def _init_worker(use_font):
+    global _use_font
+    _use_font = use_font
+
+
+def render_reports(reports, max_workers=None, chunksize=8):
+    # Gece toplu dışa aktarım: raporlar ayrı süreçlerde paralel çizilir, sıra korunur.
+    # Fontlar ana süreçte bir kez hazırlanır; işçiler indirme denemez.
+    use_font = ensure_fonts()
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(use_font,)) as pool:
+        return list(pool.map(render_pdf, reports, chunksize=chunksize))
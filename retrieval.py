@@ -0,0 +1,90 @@
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from disk_cache import content_hash
+
+# --- Belge Erişim İndeksi ---
+# CV ve portfolyo metni parçalara bölünür ve her oturum için yerel bir BM25 indeksi kurulur.
+# Sisteme tüm portfolyoyu yığmak yerine her turda son cevaba en ilgili k parça eklenir.
+# İndeks belge içeriğinin hash'i ile süreç genelinde saklanır; aynı dosyalar için yeniden kurulmaz.
+CHUNK_WORDS = 120
+CHUNK_OVERLAP = 30
+TOP_K = 4
+INDEX_CACHE_SIZE = 32
+
+_TOKEN = re.compile(r"\w{2,}")
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.replace("İ", "i").replace("I", "ı").lower())
+
+
+def chunk_text(text, source, size=CHUNK_WORDS, overlap=CHUNK_OVERLAP):
+    words = text.split()
+    step = max(1, size - overlap)
+    return [{"source": source, "text": " ".join(words[i:i + size])}
+            for i in range(0, max(len(words) - overlap, 1), step) if words[i:i + size]]
+
+
+class BM25Index:
+    def __init__(self, chunks, k1=1.5, b=0.75):
+        self.chunks = chunks
+        vocab = {}
+        rows, cols, tfs = [], [], []
+        lengths = np.zeros(len(chunks), dtype=np.float32)
+        for i, chunk in enumerate(chunks):
+            counts = {}
+            tokens = tokenize(chunk["text"])
+            lengths[i] = len(tokens)
+            for tok in tokens: counts[tok] = counts.get(tok, 0) + 1
+            for tok, tf in counts.items():
+                rows.append(i)
+                cols.append(vocab.setdefault(tok, len(vocab)))
+                tfs.append(tf)
+        self.vocab = vocab
+        # Seyrek (COO) terim-parça ağırlıkları: sorgu anında sadece toplama kalır
+        self.rows = np.asarray(rows, dtype=np.int32)
+        self.cols = np.asarray(cols, dtype=np.int32)
+        tf = np.asarray(tfs, dtype=np.float32)
+        n = max(len(chunks), 1)
+        df = np.bincount(self.cols, minlength=len(vocab)).astype(np.float32)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        avg_len = float(lengths.mean()) if len(chunks) else 1.0
+        norm = k1 * (1 - b + b * lengths[self.rows] / max(avg_len, 1.0))
+        self.weights = idf[self.cols] * tf * (k1 + 1) / (tf + norm)
+
+    def scores(self, query):
+        ids = [self.vocab[t] for t in set(tokenize(query)) if t in self.vocab]
+        if not ids: return np.zeros(len(self.chunks), dtype=np.float32)
+        mask = np.isin(self.cols, ids)
+        return np.bincount(self.rows[mask], weights=self.weights[mask], minlength=len(self.chunks))
+
+    def search(self, query, k=TOP_K):
+        if not self.chunks: return []
+        scores = self.scores(query)
+        k = min(k, len(self.chunks))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [dict(self.chunks[i], score=float(scores[i])) for i in top if scores[i] > 0]
+
+
+_indexes = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_index(documents):
+    # documents: (kaynak adı, metin) çiftleri
+    documents = list(documents)
+    key = content_hash("\0".join(f"{name}\0{text}" for name, text in documents))
+    with _lock:
+        if key in _indexes:
+            _indexes.move_to_end(key)
+            return _indexes[key]
+    index = BM25Index([chunk for name, text in documents for chunk in chunk_text(text, name)])
+    with _lock:
+        _indexes[key] = index
+        while len(_indexes) > INDEX_CACHE_SIZE: _indexes.popitem(last=False)
+    return index
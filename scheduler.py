@@ -0,0 +1,164 @@
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import metrics
+from disk_cache import content_hash
+
+# --- İstek Zamanlayıcı ---
+# Tüm Gemini çağrıları (mülakat turları, başlatma, ipucu, puanlama, özet, rapor) buradan geçer.
+# Her API anahtarının bir jeton kovası, eşzamanlı istek sınırı ve öncelik kuyruğu vardır.
+# 429 alındığında o anahtarın tüm oturumları birlikte geri çekilir (üstel + jitter) ve hız yarıya iner;
+# başarılı çağrılarla hız yavaşça yapılandırılan değere geri döner.
+# prefetch: okunmayabilecek spekülatif ipucu ön-üretimi; kota sıkışınca puanlamayı aç bırakmaması için en sonda
+PRIORITIES = {"turn": 0, "priming": 0, "hint": 1, "scoring": 2, "summary": 2, "report": 2, "prefetch": 3}
+
+
+def is_rate_limited(error):
+    return type(error).__name__ in ("ResourceExhausted", "TooManyRequests") or "429" in str(error)
+
+
+class _KeyState:
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.tokens = float(burst)
+        self.updated = now
+        self.cooldown_until = 0.0
+        self.inflight = 0
+        self.queue = []
+
+
+class Scheduler:
+    def __init__(self, requests_per_minute=15, burst=5, max_concurrent=4, max_retries=4,
+                 base_delay=2.0, max_delay=60.0, clock=time.monotonic):
+        self.rate = requests_per_minute / 60.0
+        self.min_rate = self.rate / 8
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._keys = {}
+        self._seq = itertools.count()
+        self._waits = deque(maxlen=500)
+        self._counters = {"calls": 0, "retries": 0, "rate_limited": 0, "failed": 0}
+
+    def _state(self, key):
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = _KeyState(self.rate, self.burst, self.clock())
+        return state
+
+    def _refill(self, state, now):
+        state.tokens = min(self.burst, state.tokens + (now - state.updated) * state.rate)
+        state.updated = now
+
+    def _acquire(self, key, kind):
+        entry = (PRIORITIES.get(kind, 1), next(self._seq), kind)
+        with self._cond:
+            state = self._state(key)
+            heapq.heappush(state.queue, entry)
+            enqueued = self.clock()
+            try:
+                while True:
+                    now = self.clock()
+                    self._refill(state, now)
+                    ready = state.queue[0] == entry and state.inflight < self.max_concurrent
+                    if ready and now >= state.cooldown_until and state.tokens >= 1:
+                        heapq.heappop(state.queue)
+                        state.tokens -= 1
+                        state.inflight += 1
+                        self._waits.append((kind, now - enqueued))
+                        metrics.observe("scheduler_wait_seconds", now - enqueued, kind=kind)
+                        self._cond.notify_all()
+                        return
+                    timeout = 1.0
+                    if ready:
+                        timeout = max(state.cooldown_until - now, (1 - state.tokens) / state.rate, 0.01)
+                    self._cond.wait(min(timeout, 1.0))
+            except BaseException:
+                if entry in state.queue:
+                    state.queue.remove(entry)
+                    heapq.heapify(state.queue)
+                    self._cond.notify_all()
+                raise
+
+    def _release(self, key, backoff=None):
+        with self._cond:
+            state = self._state(key)
+            state.inflight -= 1
+            if backoff is None:
+                state.rate = min(self.rate, state.rate + self.rate / 10)
+            else:
+                state.rate = max(self.min_rate, state.rate / 2)
+                state.tokens = 0.0
+                state.cooldown_until = max(state.cooldown_until, self.clock() + backoff)
+            self._cond.notify_all()
+
+    def _count(self, *names):
+        # Sayaçlar birçok iş parçacığından güncellenir; stats() ile aynı kilit altında
+        with self._cond:
+            for name in names: self._counters[name] += 1
+
+    def backoff_delay(self, attempt):
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def call(self, api_key, fn, kind="turn"):
+        key = content_hash(api_key or "")[:16]
+        self._count("calls")
+        metrics.inc("model_calls_total", kind=kind)
+        with metrics.timer("model_call_seconds", kind=kind):
+            for attempt in range(self.max_retries + 1):
+                self._acquire(key, kind)
+                try:
+                    result = fn()
+                except Exception as e:
+                    if not is_rate_limited(e) or attempt == self.max_retries:
+                        self._release(key)
+                        self._count("failed")
+                        metrics.inc("model_failures_total", kind=kind)
+                        raise
+                    self._count("rate_limited", "retries")
+                    metrics.inc("model_retries_total", kind=kind)
+                    self._release(key, backoff=self.backoff_delay(attempt))
+                    continue
+                self._release(key)
+                return result
+
+    def stats(self):
+        with self._cond:
+            queued = {}
+            for state in self._keys.values():
+                for _, _, kind in state.queue: queued[kind] = queued.get(kind, 0) + 1
+            waits = [w for _, w in self._waits]
+            return {
+                "queued": queued,
+                "queue_depth": sum(queued.values()),
+                "inflight": sum(s.inflight for s in self._keys.values()),
+                "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+                "max_wait": max(waits) if waits else 0.0,
+                "rate_per_minute": {k: round(s.rate * 60, 2) for k, s in self._keys.items()},
+                **self._counters,
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler(
+                requests_per_minute=float(os.environ.get("MULAKAT_RPM", 15)),
+                max_concurrent=int(os.environ.get("MULAKAT_MAX_CONCURRENT", 4)),
+            )
+    return _scheduler
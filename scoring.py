@@ -0,0 +1,189 @@
+import itertools
+import json
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from interview_core import CATEGORIES, TIMEOUT_ANSWER
+
+# --- Cevap Bazlı Puanlama ---
+# Her cevap geldiği anda arka planda tek başına puanlanır (JSON çıktı) ve toplam güncellenir.
+# Mülakat bitince tüm geçmişi yeniden göndermek yerine mevcut puanlar birleştirilir ve
+# sadece kısa bir özet istenir; bitiş süresi mülakatın uzunluğundan bağımsız kalır.
+# Puanlanamayan cevaplar 0 sayılmaz: bitişte bir kez yeniden denenir, süre sınırında kalanlar raporda başarısız olarak işaretlenir.
+JSON_CONFIG = {"response_mime_type": "application/json"}
+PASS_SCORE = 60
+
+SCORING_PROMPT = """CEVAP DEĞERLENDİRME
+Sen bir işe alım değerlendiricisisin. Aşağıdaki mülakat sorusuna verilen TEK cevabı puanla.
+Cevap bir kategori hakkında bilgi vermiyorsa o kategori için null yaz.
+Sadece şu JSON'u döndür:
+{{"TEKNİK": 0-100|null, "İLETİŞİM": 0-100|null, "PROBLEM_ÇÖZME": 0-100|null, "TEORİK_BİLGİ": 0-100|null, "POTANSİYEL": 0-100|null, "not": "tek cümlelik gözlem"}}
+
+SORU: {question}
+CEVAP: {answer}
+"""
+
+SUMMARY_PROMPT = """MÜLAKAT ÖZETİ
+Bir adayın mülakatı bitti. Kategori ortalamaları ve cevap bazlı gözlemler aşağıda.
+KATEGORİLER: {scores}
+GENEL PUAN: {score}
+GÖZLEMLER:
+{notes}
+Sadece şu JSON'u döndür:
+{{"KARAR": "Olumlu"|"Olumsuz", "RAPOR": "kısa sözel değerlendirme"}}
+"""
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="scoring")
+_FENCE = re.compile(r"^```(?:json)?|```$", re.MULTILINE)
+
+
+def parse_json(text):
+    return json.loads(_FENCE.sub("", text).strip())
+
+
+def clamp_score(value):
+    try: return max(0, min(100, int(round(float(value)))))
+    except (TypeError, ValueError): return None
+
+
+class AnswerScorer:
+    # model: JSON çıktı için yapılandırılmış GenerativeModel (generation_config=JSON_CONFIG)
+    def __init__(self, model, scheduler=None, api_key=None):
+        self.model = model
+        self.scheduler = scheduler
+        self.api_key = api_key
+        self._lock = threading.Lock()
+        self._sums = {cat: 0 for cat in CATEGORIES}
+        self._counts = {cat: 0 for cat in CATEGORIES}
+        self._seq = itertools.count()
+        self._futures = {}
+        self._unscored = {}  # sıra -> (soru, cevap); puanı henüz toplama girmemiş cevaplar
+        self._closed = False
+        self.notes = []
+        self.answers = 0
+        self.failed = 0
+
+    def _generate(self, prompt, kind):
+        call = lambda: self.model.generate_content(prompt).text
+        if self.scheduler is None: return call()
+        return self.scheduler.call(self.api_key, call, kind=kind)
+
+    def _add(self, scores, note=None, seq=None):
+        with self._lock:
+            # Rapor oluşturulduktan sonra gelen sonuçlar toplamı değiştirmez
+            if self._closed: return
+            self._unscored.pop(seq, None)
+            self.answers += 1
+            for cat in CATEGORIES:
+                value = clamp_score(scores.get(cat))
+                if value is None: continue
+                self._sums[cat] += value
+                self._counts[cat] += 1
+            if note: self.notes.append(note)
+
+    def _evaluate(self, question, answer):
+        return parse_json(self._generate(SCORING_PROMPT.format(question=question, answer=answer), "scoring"))
+
+    def _score(self, seq, question, answer):
+        try: result = self._evaluate(question, answer)
+        except Exception:
+            with self._lock: self.failed += 1
+            return
+        self._add(result, result.get("not"), seq)
+
+    def submit(self, question, answer):
+        # Süre dolmuşsa puan yerel olarak 0 kabul edilir, modele gidilmez
+        if answer == TIMEOUT_ANSWER:
+            self._add({cat: 0 for cat in CATEGORIES}, "Aday süre içinde cevap vermedi.")
+            return None
+        with self._lock:
+            seq = next(self._seq)
+            self._unscored[seq] = (question, answer)
+            future = self._futures[seq] = _executor.submit(self._score, seq, question, answer)
+        return future
+
+    def snapshot(self):
+        # Kalıcı kayıt için tamamlanmış puanlar; henüz puanlanmamış cevaplar bitişte yeniden denenmek üzere saklanır
+        with self._lock:
+            return {"sums": dict(self._sums), "counts": dict(self._counts), "notes": list(self.notes),
+                    "answers": self.answers, "failed": self.failed,
+                    "unscored": [list(pair) for pair in self._unscored.values()]}
+
+    def restore(self, state):
+        with self._lock:
+            self._sums.update(state.get("sums", {}))
+            self._counts.update(state.get("counts", {}))
+            self.notes = list(state.get("notes", []))
+            self.answers = state.get("answers", 0)
+            self.failed = state.get("failed", 0)
+            for question, answer in state.get("unscored", []): self._unscored[next(self._seq)] = (question, answer)
+
+    def pending(self):
+        with self._lock: return sum(not f.done() for f in self._futures.values())
+
+    def aggregate(self):
+        with self._lock:
+            means = {cat: round(self._sums[cat] / self._counts[cat]) for cat in CATEGORIES if self._counts[cat]}
+        # Hiç ölçülemeyen kategori sessizce 50 olmaz: ölçülenlerin ortalaması kullanılır ve işaretlenir
+        fallback = round(sum(means.values()) / len(means)) if means else 0
+        missing = [cat for cat in CATEGORIES if cat not in means]
+        values = [means.get(cat, fallback) for cat in CATEGORIES]
+        return values, missing
+
+    def _retry(self, seq, question, answer):
+        try: result = self._evaluate(question, answer)
+        except Exception: return
+        self._add(result, result.get("not"), seq)
+
+    def finish(self, timeout=30):
+        # Bekleme ve yeniden denemeler aynı süre sınırını paylaşır; sınırda hâlâ puanı olmayan cevaplar başarısız sayılır
+        deadline = time.monotonic() + timeout
+        with self._lock: futures = dict(self._futures)
+        retries = {}
+        outstanding = set(futures.values())
+        while True:
+            # Başarısız (ya da önceki süreçte yarım kalmış) puanlamalar biter bitmez bir kez, eşzamanlı yeniden denenir
+            with self._lock:
+                for seq, (question, answer) in self._unscored.items():
+                    if seq in retries or (seq in futures and not futures[seq].done()): continue
+                    retries[seq] = _executor.submit(self._retry, seq, question, answer)
+                    outstanding.add(retries[seq])
+            remaining = deadline - time.monotonic()
+            if not outstanding or remaining <= 0: break
+            _, outstanding = wait(outstanding, timeout=remaining, return_when=FIRST_COMPLETED)
+        with self._lock:
+            self._closed = True
+            failed = len(self._unscored)
+        for future in list(futures.values()) + list(retries.values()): future.cancel()
+
+        values, missing = self.aggregate()
+        if self.answers:
+            score = round(sum(values) / len(values))
+            decision = "Olumlu" if score >= PASS_SCORE else "Olumsuz"
+            text = "\n".join(f"- {n}" for n in self.notes[-10:]) or "Cevaplar için gözlem notu yok."
+            try:
+                prompt = SUMMARY_PROMPT.format(scores=dict(zip(CATEGORIES, values)), score=score,
+                                               notes="\n".join(self.notes[-30:]))
+                summary = parse_json(self._generate(prompt, "report"))
+                decision = summary.get("KARAR", decision).strip() or decision
+                text = summary.get("RAPOR", text)
+            except Exception: pass
+            if score == 0: decision = "Olumsuz"
+        elif failed:
+            # Hiçbir cevap puanlanamadı: altyapı hatası aday aleyhine bir karara dönüşmez
+            score, decision = None, "Değerlendirilemedi"
+            text = f"{failed} cevap puanlanamadı; rapor daha sonra yeniden oluşturulmalı."
+        else:
+            score, decision, text = 0, "Olumsuz", "Değerlendirilecek cevap bulunamadı."
+        return {
+            "score": score,
+            "decision": decision,
+            "categories": list(CATEGORIES),
+            "values": values,
+            "text": text,
+            "missing": missing,
+            "scored": self.answers,
+            "failed": failed,
+        }
@@ -0,0 +1,243 @@
+import hmac
+import json
+import logging
+import os
+import queue
+import secrets
+import sqlite3
+import threading
+import time
+import uuid
+
+import metrics
+from disk_cache import CACHE_ROOT, content_hash
+
+# --- Kalıcı Oturum Kaydı ---
+# Mülakatlar SQLite'a yazılır; tarayıcı yenilense ya da sunucu yeniden başlasa da oturum URL'deki
+# kimlikle geri yüklenir. Sohbet geçmişi kayıtlı turlardan yerel olarak kurulur, modele yeniden
+# priming yapılmaz. Yazmalar arka plandaki tek bir iş parçacığında toplu işlem (transaction) olarak
+# yapılır; betik iş parçacığı sadece kuyruğa ekler. Okumalar WAL sayesinde yazmayı beklemez.
+# URL'deki oturum kimliği tek başına yetmez: oturum, sadece onu başlatan tarayıcının bildiği bir anahtarla
+# (veritabanında hash'i tutulur) açılır. Başarısız yazmalar loglanır, sayılır ve ilgili oturum işaretlenir.
+DB_PATH = os.environ.get("MULAKAT_DB") or os.path.join(CACHE_ROOT, "sessions.sqlite3")
+FLUSH_INTERVAL = 0.5
+BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    candidate TEXT,
+    model TEXT,
+    jd_hash TEXT,
+    job_description TEXT,
+    system_prompt TEXT,
+    secret_hash TEXT,
+    documents TEXT,
+    state TEXT,
+    created_at REAL,
+    updated_at REAL,
+    finished_at REAL,
+    finish_seq INTEGER,
+    score INTEGER,
+    decision TEXT,
+    report TEXT
+);
+CREATE TABLE IF NOT EXISTS turns (
+    session_id TEXT,
+    seq INTEGER,
+    role TEXT,
+    content TEXT,
+    created_at REAL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_sessions_candidate ON sessions (candidate, created_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions (created_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_jd_score ON sessions (jd_hash, score);
+CREATE INDEX IF NOT EXISTS idx_turns_created ON turns (created_at);
+"""
+# Önceki sürümlerde oluşturulmuş veritabanlarına sonradan eklenen sütunlar; sütun yeni eklendiyse
+# BACKFILL'deki sorgu mevcut satırları doldurur. İndeksler sütunlar eklendikten sonra oluşturulur.
+MIGRATIONS = {"sessions": {"secret_hash": "TEXT", "finish_seq": "INTEGER"}}
+BACKFILL = {("sessions", "finish_seq"): "UPDATE sessions SET finish_seq = rowid WHERE finished_at IS NOT NULL"}
+POST_MIGRATION = "CREATE INDEX IF NOT EXISTS idx_sessions_finish_seq ON sessions (finish_seq);"
+log = logging.getLogger(__name__)
+
+
+def new_session_id():
+    return uuid.uuid4().hex[:16]
+
+
+def new_session_secret():
+    return secrets.token_urlsafe(16)
+
+
+def jd_key(job_description):
+    # Aynı ilana ait mülakatları karşılaştırmak için kısa anahtar
+    return content_hash(job_description.strip())[:16]
+
+
+class SessionStore:
+    def __init__(self, path=DB_PATH, flush_interval=FLUSH_INTERVAL, batch_size=BATCH_SIZE):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            for table, columns in MIGRATIONS.items():
+                existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+                for name, kind in columns.items():
+                    if name in existing: continue
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {kind}")
+                    if (table, name) in BACKFILL: conn.execute(BACKFILL[table, name])
+            conn.executescript(POST_MIGRATION)
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self.written = 0
+        self.batches = 0
+        self.errors = []
+        self.failed_sessions = set()
+        threading.Thread(target=self._writer, daemon=True, name="session-store").start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None: conn = self._local.conn = self._connect()
+        return conn
+
+    # --- Yazma (arka plan) ---
+    def _writer(self):
+        conn = self._connect()
+        while True:
+            ops = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(ops) < self.batch_size and not isinstance(ops[-1], threading.Event):
+                try: ops.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty: break
+            events = [op for op in ops if isinstance(op, threading.Event)]
+            statements = [op for op in ops if not isinstance(op, threading.Event)]
+            if statements:
+                try:
+                    with conn:
+                        for sql, params, _ in statements: conn.execute(sql, params)
+                    self.written += len(statements)
+                    self.batches += 1
+                except sqlite3.Error as e:
+                    # Toplu işlem geri alındı: bu yazmalar kayboldu; oturumlar arayüzde uyarı için işaretlenir
+                    self.errors = (self.errors + [f"{type(e).__name__}: {e}"])[-20:]
+                    self.failed_sessions.update(sid for _, _, sid in statements)
+                    metrics.inc("session_store_errors_total", len(statements), error=type(e).__name__)
+                    log.error("Oturum kaydı yazılamadı (%d işlem): %s: %s", len(statements), type(e).__name__, e)
+            for event in events: event.set()
+
+    def _put(self, sql, params, session_id):
+        self._queue.put((sql, params, session_id))
+
+    def flush(self, timeout=5):
+        # Kuyruktaki tüm yazmalar işlenene kadar bekle (okumadan önce ya da kapanışta)
+        event = threading.Event()
+        self._queue.put(event)
+        return event.wait(timeout)
+
+    def create(self, session_id, candidate, model, job_description, system_prompt, documents=(), secret=None):
+        # secret verilmezse (ör. toplu tarama) oturum URL ile açılamaz; sadece yönetici görebilir
+        now = time.time()
+        self._put("INSERT OR REPLACE INTO sessions (id, candidate, model, jd_hash, job_description, system_prompt, "
+                  "secret_hash, documents, state, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, '{}', ?, ?)",
+                  (session_id, candidate, model, jd_key(job_description), job_description, system_prompt,
+                   content_hash(secret) if secret else None, json.dumps(list(documents), ensure_ascii=False), now, now),
+                  session_id)
+
+    def append_turns(self, session_id, start, messages):
+        # start: ilk mesajın sıra numarası; aynı sıra tekrar yazılırsa üzerine yazılır
+        now = time.time()
+        for seq, message in enumerate(messages, start):
+            self._put("INSERT OR REPLACE INTO turns (session_id, seq, role, content, created_at) VALUES (?, ?, ?, ?, ?)",
+                      (session_id, seq, message["role"], message["content"], now), session_id)
+
+    def save_state(self, session_id, state):
+        self._put("UPDATE sessions SET state = ?, updated_at = ? WHERE id = ?",
+                  (json.dumps(state, ensure_ascii=False), time.time(), session_id), session_id)
+
+    def finish(self, session_id, report):
+        # finish_seq yazma işlemi içinde (commit sırasıyla) artar; finished_at ise kuyruğa eklenme anıdır ve
+        # toplu yazmada daha eski bir zamanla sonradan görünebilir. Artımlı okuma bu yüzden finish_seq'e dayanır.
+        now = time.time()
+        self._put("UPDATE sessions SET finished_at = ?, updated_at = ?, score = ?, decision = ?, report = ?, "
+                  "finish_seq = (SELECT COALESCE(MAX(finish_seq), 0) + 1 FROM sessions) WHERE id = ?",
+                  (now, now, report["score"], report["decision"], json.dumps(report, ensure_ascii=False), session_id),
+                  session_id)
+
+    # --- Okuma ---
+    def check_secret(self, session_id, secret):
+        self.flush()
+        row = self._reader().execute("SELECT secret_hash FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None or not row["secret_hash"] or not secret: return False
+        return hmac.compare_digest(row["secret_hash"], content_hash(secret))
+
+    def write_failed(self, session_id):
+        return session_id in self.failed_sessions
+
+    def load(self, session_id):
+        self.flush()
+        conn = self._reader()
+        row = conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None: return None
+        record = dict(row)
+        del record["secret_hash"]
+        record["documents"] = [tuple(d) for d in json.loads(record["documents"] or "[]")]
+        record["state"] = json.loads(record["state"] or "{}")
+        record["report"] = json.loads(record["report"]) if record["report"] else None
+        record["messages"] = [{"role": r["role"], "content": r["content"]} for r in conn.execute(
+            "SELECT role, content FROM turns WHERE session_id = ? ORDER BY seq", (session_id,))]
+        return record
+
+    def recent(self, limit=50, candidate=None, jd_hash=None, finished=True):
+        where, params = [], []
+        if candidate: where.append("candidate = ?"); params.append(candidate)
+        if jd_hash: where.append("jd_hash = ?"); params.append(jd_hash)
+        if finished: where.append("finished_at IS NOT NULL")
+        sql = ("SELECT id, candidate, model, created_at, finished_at, score, decision FROM sessions"
+               + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY created_at DESC LIMIT ?")
+        return [dict(r) for r in self._reader().execute(sql, params + [limit])]
+
+    def finished_reports(self, after=0):
+        # Sıralama tablosunun artımlı yüklemesi için (finish_seq > after); title ilanın ilk satırından kısa bir etiket
+        return self._reader().execute(
+            "SELECT id, candidate, jd_hash, finished_at, finish_seq, report, substr(job_description, 1, 80) AS title "
+            "FROM sessions WHERE finish_seq > ? AND report IS NOT NULL ORDER BY finish_seq", (after,))
+
+    def summary(self, jd_hash=None, score=None):
+        # Tamamlanmış mülakatların özeti; score verilirse bu puanın altında kalanların oranı da döner
+        where = "finished_at IS NOT NULL AND score IS NOT NULL" + (" AND jd_hash = ?" if jd_hash else "")
+        params = [jd_hash] if jd_hash else []
+        row = self._reader().execute(
+            f"SELECT COUNT(*) AS count, AVG(score) AS avg_score, SUM(decision LIKE '%Olumlu%') AS passed "
+            f"FROM sessions WHERE {where}", params).fetchone()
+        result = {"count": row["count"], "avg_score": row["avg_score"] or 0, "passed": row["passed"] or 0}
+        if score is not None and row["count"]:
+            below = self._reader().execute(f"SELECT COUNT(*) FROM sessions WHERE {where} AND score < ?",
+                                           params + [score]).fetchone()[0]
+            result["percentile"] = below / row["count"]
+        return result
+
+    def stats(self):
+        return {"queued": self._queue.qsize(), "written": self.written, "batches": self.batches,
+                "errors": len(self.errors), "last_error": self.errors[-1] if self.errors else None}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None: _store = SessionStore()
+    return _store
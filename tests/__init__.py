@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# --- Testler ---
+# Ağ ve Streamlit gerektirmez; depo kökünden çalıştırılır:
+#   python -m pytest tests        ya da        python -m unittest discover -s tests -t .
+# Disk önbellekleri geçici bir klasöre yazılır (modüller CACHE_ROOT'u import anında okur).
+os.environ.setdefault("MULAKAT_CACHE_DIR", tempfile.mkdtemp(prefix="mulakat_test_"))
@@ -0,0 +1,31 @@
+import os
+import tempfile
+import unittest
+
+from batch_screen import run_interview
+from fake_gemini import FakeBackend, FakeModel
+
+
+class BatchScreenTest(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(prefix="mulakat_batch_"), "aday.txt")
+        with open(self.path, "w", encoding="utf-8") as f: f.write("Python geliştirici, Django ve Kafka deneyimi")
+        self.backend = FakeBackend()
+        self.make_model = lambda si: FakeModel(self.backend, system_instruction=si)
+
+    def test_answers_are_scored_one_by_one(self):
+        answers = {"*": ["Django ile REST servisleri yazdım.", "Kafka tüketicilerini ölçekledim."]}
+        record = run_interview(self.path, "Backend ilanı", answers, self.make_model, None, None,
+                               scoring_model=FakeModel(self.backend))
+        self.assertNotIn("error", record)
+        self.assertEqual((record["turns"], record["scored"], record["failed"]), (2, 2, 0))
+        self.assertIsNotNone(record["score"])
+        self.assertEqual(len(record["values"]), 5)
+
+    def test_errors_are_recorded(self):
+        record = run_interview(self.path + ".yok", "İlan", {"*": []}, self.make_model, None, None)
+        self.assertTrue(record["error"].startswith("FileNotFoundError"))
+
+
+if __name__ == "__main__":
+    unittest.main()
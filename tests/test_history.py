@@ -0,0 +1,58 @@
+import unittest
+from types import SimpleNamespace
+
+from history import SUMMARY_ACK, HistoryManager, estimate_tokens, fit_text
+
+
+class Chat:
+    def __init__(self):
+        self.history = [{"role": "user", "parts": ["Açılış"]}, {"role": "model", "parts": ["İlk soru?"]}]
+
+    def add_turn(self, i):
+        self.history += [{"role": "user", "parts": [f"Cevap {i}: " + "ayrıntı " * 50]},
+                         {"role": "model", "parts": [f"Soru {i + 1}?"]}]
+
+
+class SummaryModel:
+    def __init__(self): self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(text="- Aday Django ve Kafka deneyimini anlattı.")
+
+
+class HistoryManagerTest(unittest.TestCase):
+    def test_fit_text_keeps_head_and_tail(self):
+        text = "KİMLİK " + "belge " * 2000 + " KURALLAR"
+        fitted = fit_text(text, 200)
+        self.assertLessEqual(estimate_tokens(fitted), 200)
+        self.assertTrue(fitted.startswith("KİMLİK") and fitted.endswith("KURALLAR"))
+
+    def test_compacts_old_turns_over_budget(self):
+        chat, model = Chat(), SummaryModel()
+        manager = HistoryManager(chat, model, budget=300, keep_recent=2)
+        for i in range(8):
+            manager.before_send("cevap")
+            chat.add_turn(i)
+            manager.after_turn()
+            if manager._pending: manager._pending[0].result()
+        manager.before_send("cevap")
+        self.assertGreaterEqual(manager.compactions, 1)
+        self.assertEqual(chat.history[:2], Chat().history[:2])  # açılış ve ilk soru korunur
+        self.assertEqual(chat.history[3]["parts"], [SUMMARY_ACK])
+        self.assertEqual(chat.history[-1]["parts"], ["Soru 8?"])
+        self.assertLessEqual(len(chat.history), 2 + 2 + 2 * 2 + 2)
+        self.assertIn("Cevap 0", model.prompts[0])
+
+    def test_under_budget_history_is_untouched(self):
+        chat, model = Chat(), SummaryModel()
+        manager = HistoryManager(chat, model, budget=10 ** 6)
+        for i in range(5):
+            chat.add_turn(i)
+            manager.after_turn()
+        self.assertEqual((len(chat.history), manager.compactions, model.prompts), (12, 0, []))
+        self.assertEqual(manager.stats()["history_tokens"], manager.history_tokens())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from types import SimpleNamespace
+
+from llm import ReplyError, send_message
+
+
+class Reason:
+    def __init__(self, name): self.name = name
+
+
+class Response:
+    # google.generativeai akış yanıtının kullanılan kısmı: parçalar, resolve() ve finish_reason
+    def __init__(self, pieces, finish="STOP", error=None):
+        self.pieces = pieces
+        self.error = error
+        self.candidates = [SimpleNamespace(finish_reason=Reason(finish))]
+
+    def __iter__(self):
+        for piece in self.pieces: yield SimpleNamespace(text=piece)
+        if self.error: raise self.error
+
+    def resolve(self): pass
+
+    @property
+    def text(self): return "".join(self.pieces)
+
+
+class Chat:
+    # ChatSession gibi: gönderilen mesaj ve yanıt geçmişe eklenir, rewind() son çifti geri alır
+    def __init__(self, response):
+        self.response = response
+        self.history = []
+
+    def send_message(self, message, stream=False):
+        self.history += [message, self.response.text]
+        return self.response
+
+    def rewind(self):
+        del self.history[-2:]
+
+
+class StreamTest(unittest.TestCase):
+    def test_streams_text_and_keeps_turn(self):
+        chat, seen, first = Chat(Response(["Merhaba, ", "ilk soru?"])), [], []
+        text = send_message(chat, "selam", stream=True, on_first_token=lambda: first.append(1), on_text=seen.append)
+        self.assertEqual(text, "Merhaba, ilk soru?")
+        self.assertEqual(seen, ["Merhaba, ", "Merhaba, ilk soru?"])
+        self.assertEqual(first, [1])
+        self.assertEqual(len(chat.history), 2)
+
+    def test_broken_stream_rewinds(self):
+        chat = Chat(Response(["Yarım"], error=RuntimeError("bağlantı koptu")))
+        with self.assertRaises(ReplyError): send_message(chat, "selam", stream=True)
+        self.assertEqual(chat.history, [])
+
+    def test_bad_finish_reason_rewinds(self):
+        chat = Chat(Response(["Kısmi"], finish="SAFETY"))
+        with self.assertRaises(ReplyError): send_message(chat, "selam", stream=True)
+        self.assertEqual(chat.history, [])
+
+    def test_empty_reply_rewinds_without_starting_timer(self):
+        chat, first = Chat(Response([])), []
+        with self.assertRaises(ReplyError): send_message(chat, "selam", stream=True, on_first_token=lambda: first.append(1))
+        self.assertEqual((chat.history, first), ([], []))
+
+    def test_empty_blocking_reply_rewinds(self):
+        chat = Chat(Response([]))
+        with self.assertRaises(ReplyError): send_message(chat, "selam")
+        self.assertEqual(chat.history, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from unittest import mock
+
+from fpdf import FPDF
+
+import pdf_extract
+
+
+def make_pdf(pages):
+    pdf = FPDF()
+    for i in range(pages):
+        pdf.add_page()
+        pdf.set_font("Arial", size=12)
+        pdf.cell(0, 10, f"Sayfa {i + 1} Python Django", 0, 1)
+    out = pdf.output(dest="S")
+    return out.encode("latin-1") if isinstance(out, str) else bytes(out)
+
+
+class ExtractPdfTest(unittest.TestCase):
+    def test_second_read_comes_from_cache(self):
+        data = make_pdf(2) + b"\n% ilk"
+        first = pdf_extract.extract_pdf(data)
+        second = pdf_extract.extract_pdf(data)
+        self.assertEqual((first["cached"], second["cached"]), (False, True))
+        self.assertEqual(first["text"], second["text"])
+        self.assertIn("Sayfa 2", first["text"])
+
+    def test_cache_write_failure_keeps_result(self):
+        data = make_pdf(1) + b"\n% disk dolu"
+        with mock.patch.object(pdf_extract._cache, "put", side_effect=OSError(28, "No space left on device")):
+            with self.assertLogs("pdf_extract", "WARNING"):
+                result = pdf_extract.extract_pdf(data)
+        self.assertIn("Sayfa 1", result["text"])
+        self.assertIsNone(result["error"])
+
+    def test_unreadable_file_reports_error(self):
+        result = pdf_extract.extract_pdf(b"pdf degil")
+        self.assertEqual((result["text"], result["pages"]), ("", []))
+        self.assertIsNotNone(result["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
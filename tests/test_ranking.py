@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from interview_core import CATEGORIES, parse_report
+from ranking import JDColumns, ReportTable
+from session_store import SessionStore
+
+
+def report(values, score=None, missing=()):
+    return {"values": list(values), "score": sum(values) // len(values) if score is None else score,
+            "decision": "Olumlu", "missing": list(missing)}
+
+
+class ReportTableTest(unittest.TestCase):
+    def test_weighted_rank(self):
+        table = ReportTable()
+        table.add("teknik", "a.pdf", "ilan", report([100, 20, 20, 20, 20]))
+        table.add("iletisim", "b.pdf", "ilan", report([20, 100, 20, 20, 20]))
+        columns = table.jds["ilan"]
+        self.assertEqual([r["id"] for r in columns.rank([1, 0, 0, 0, 0], k=2)], ["teknik", "iletisim"])
+        self.assertEqual([r["id"] for r in columns.rank([0, 1, 0, 0, 0], k=2)], ["iletisim", "teknik"])
+        self.assertEqual(len(columns.rank([0] * 5, k=10)), 2)
+
+    def test_unusable_reports_are_skipped(self):
+        table = ReportTable()
+        self.assertFalse(table.add("skorsuz", "a.pdf", "ilan", report([70] * 5) | {"score": None}))
+        self.assertFalse(table.add("eksik", "b.pdf", "ilan", report([50] * 5, missing=CATEGORIES)))
+        self.assertFalse(table.add("kisa", "c.pdf", "ilan", report([70] * 3)))
+        self.assertTrue(table.add("tamam", "d.pdf", "ilan", report([70] * 5)))
+        self.assertFalse(table.add("tamam", "d.pdf", "ilan", report([70] * 5)))
+        self.assertEqual(len(table.jds["ilan"]), 1)
+
+    def test_percentile_bands(self):
+        ranks = JDColumns.percentile_ranks(np.arange(100, dtype=np.float32))
+        bands = JDColumns.bands(ranks)
+        self.assertEqual((bands[99], bands[80], bands[0]), ("Üst %10", "Üst %25", "Alt %25"))
+        self.assertEqual(JDColumns.percentile_ranks(np.full(4, 50.0)).tolist(), [0.5] * 4)
+
+    def test_unparsed_report_has_no_score(self):
+        parsed = parse_report("Model biçimsiz bir yanıt döndürdü.")
+        self.assertIsNone(parsed["score"])
+        self.assertEqual(parsed["missing"], list(CATEGORIES))
+        self.assertFalse(ReportTable().add("x", "x.pdf", "ilan", parsed))
+
+    def test_refresh_loads_only_new_reports_in_commit_order(self):
+        store = SessionStore(os.path.join(tempfile.mkdtemp(prefix="mulakat_rank_"), "s.sqlite3"), flush_interval=0.01)
+        table = ReportTable()
+
+        def finish(sid, values):
+            store.create(sid, f"{sid}.pdf", "m", "İlan", "sistem")
+            store.finish(sid, report(values))
+            store.flush()
+
+        finish("a", [60] * 5)
+        self.assertEqual(table.refresh(store), 1)
+        finish("b", [80] * 5)
+        self.assertEqual([r["finish_seq"] for r in store.finished_reports()], [1, 2])
+        self.assertEqual((table.refresh(store), table.refresh(store)), (1, 0))
+        self.assertEqual(sorted(c.ids for c in table.jds.values())[0], ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
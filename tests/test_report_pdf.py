@@ -0,0 +1,36 @@
+import unittest
+from unittest import mock
+
+import requests
+
+import report_pdf
+
+REPORT = {"score": 72, "decision": "Olumlu", "categories": ["TEKNİK", "İLETİŞİM"], "values": [80, 64],
+          "text": "Aday güçlü bir iletişim sergiledi."}
+
+
+class FontTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.multiple(report_pdf, _use_font=None, _font_retry_at=0.0, FONT_DIR="/nonexistent-fonts")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_failed_download_is_retried_after_backoff(self):
+        with mock.patch.object(report_pdf.requests, "get", side_effect=requests.ConnectionError("ağ yok")) as get:
+            self.assertEqual(report_pdf.ensure_fonts(), "Arial")
+            self.assertEqual(report_pdf.ensure_fonts(), "Arial")
+            self.assertEqual(get.call_count, len(report_pdf.FONTS))  # geri çekilme süresince tekrar denenmez
+            report_pdf._font_retry_at = 0.0
+            report_pdf.ensure_fonts()
+            self.assertEqual(get.call_count, 2 * len(report_pdf.FONTS))
+        self.assertIsNone(report_pdf._use_font)
+
+    def test_fallback_font_renders_and_is_memoized(self):
+        with mock.patch.object(report_pdf.requests, "get", side_effect=requests.ConnectionError("ağ yok")):
+            first = report_pdf.create_pdf_report(REPORT)
+            self.assertIs(report_pdf.create_pdf_report(dict(REPORT)), first)
+        self.assertTrue(first.startswith(b"%PDF"))
+
+
+if __name__ == "__main__":
+    unittest.main()
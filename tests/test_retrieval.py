@@ -0,0 +1,46 @@
+import unittest
+
+from fake_gemini import FakeModel
+from interview_core import CONTEXT_HEADER, Interview
+from retrieval import BM25Index, chunk_text, get_index
+
+DOCUMENTS = [
+    ("cv.pdf", "Python ve Django ile REST servisleri geliştirdim. PostgreSQL sorgularını optimize ettim. " * 30),
+    ("proje.pdf", "Kafka ile olay akışı kurdum; tüketici gecikmesini Prometheus ile izledim. " * 30),
+]
+
+
+class RetrievalTest(unittest.TestCase):
+    def test_chunks_overlap_and_cover_text(self):
+        words = [f"k{i}" for i in range(300)]
+        chunks = chunk_text(" ".join(words), "cv.pdf", size=100, overlap=20)
+        self.assertEqual(chunks[0]["text"].split()[-20:], chunks[1]["text"].split()[:20])
+        self.assertEqual(chunks[-1]["text"].split()[-1], "k299")
+        self.assertTrue(all(c["source"] == "cv.pdf" for c in chunks))
+
+    def test_search_ranks_matching_document_first(self):
+        index = BM25Index([c for name, text in DOCUMENTS for c in chunk_text(text, name)])
+        results = index.search("Kafka tüketici gecikmesi", k=2)
+        self.assertEqual(results[0]["source"], "proje.pdf")
+        self.assertEqual(index.search("tamamen alakasız kelimeler"), [])
+
+    def test_turkish_case_folding(self):
+        index = BM25Index(chunk_text("İSTANBUL ofisinde çalıştım", "cv.pdf"))
+        self.assertEqual(len(index.search("istanbul")), 1)
+
+    def test_index_is_shared_for_same_documents(self):
+        self.assertIs(get_index(DOCUMENTS), get_index(list(DOCUMENTS)))
+
+    def test_chunks_stay_out_of_chat_history(self):
+        model = FakeModel()
+        interview = Interview(lambda si: FakeModel(model.backend, system_instruction=si), "Backend geliştirici",
+                              "CV", retriever=get_index(DOCUMENTS))
+        interview.start()
+        interview.answer("Kafka ile ne yaptınız?")
+        user_turns = [c["parts"][0] for c in interview.chat.history if c["role"] == "user"]
+        self.assertEqual(user_turns[-1], "Kafka ile ne yaptınız?")
+        self.assertFalse(any(CONTEXT_HEADER in text for text in user_turns))
+
+
+if __name__ == "__main__":
+    unittest.main()
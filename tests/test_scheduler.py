@@ -0,0 +1,79 @@
+import threading
+import time
+import unittest
+
+from fake_gemini import FakeBackend, FakeModel, RateLimitError
+from scheduler import Scheduler
+
+FAST = dict(requests_per_minute=10 ** 6, burst=10 ** 6, base_delay=0.01, max_delay=0.05)
+
+
+class SchedulerTest(unittest.TestCase):
+    def test_backs_off_and_retries_on_429(self):
+        # Arka ucun kota penceresi elle ilerletilen bir saatle çalışır; her ret pencereyi yarım dakika ilerletir
+        clock = [0.0]
+        model = FakeModel(FakeBackend(requests_per_minute=2, clock=lambda: clock[0]))
+
+        def quota_call():
+            try: return model.generate_content("soru").text
+            except RateLimitError:
+                clock[0] += 30
+                raise
+
+        scheduler = Scheduler(max_retries=4, **FAST)
+        for _ in range(3): scheduler.call("test", quota_call)
+        stats = scheduler.stats()
+        self.assertEqual((stats["retries"], stats["rate_limited"], stats["failed"]), (2, 2, 0))
+        self.assertEqual(model.backend.rejected, 2)
+
+    def test_gives_up_after_max_retries(self):
+        scheduler = Scheduler(max_retries=2, **FAST)
+        model = FakeModel(FakeBackend(requests_per_minute=0))
+        with self.assertRaises(RateLimitError): scheduler.call("test", lambda: model.generate_content("soru").text)
+        self.assertEqual((scheduler.stats()["retries"], scheduler.stats()["failed"]), (2, 1))
+
+    def test_other_errors_are_not_retried(self):
+        scheduler = Scheduler(max_retries=3, **FAST)
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise ValueError("bozuk istek")
+
+        with self.assertRaises(ValueError): scheduler.call("test", broken)
+        self.assertEqual((len(calls), scheduler.stats()["retries"]), (1, 0))
+
+    def test_queued_calls_run_by_priority(self):
+        # Tek yuva meşgulken sıraya girenler tür önceliğiyle (geliş sırasından bağımsız) çalışır
+        scheduler = Scheduler(max_concurrent=1, **FAST)
+        gate, order = threading.Event(), []
+        blocker = threading.Thread(target=scheduler.call, args=("test", gate.wait), kwargs={"kind": "turn"})
+        blocker.start()
+        while not scheduler.stats()["inflight"]: time.sleep(0.001)
+        threads = []
+        for kind in ["prefetch", "report", "scoring", "hint", "summary", "turn"]:
+            threads.append(threading.Thread(target=scheduler.call, args=("test", lambda k=kind: order.append(k)),
+                                            kwargs={"kind": kind}))
+            threads[-1].start()
+            while scheduler.stats()["queue_depth"] < len(threads): time.sleep(0.001)
+        gate.set()
+        for t in [blocker] + threads: t.join()
+        self.assertEqual(order, ["turn", "hint", "report", "scoring", "summary", "prefetch"])
+
+    def test_concurrency_limit_per_key(self):
+        scheduler = Scheduler(max_concurrent=3, **FAST)
+        lock, running, peak = threading.Lock(), [0], [0]
+
+        def slow():
+            with lock: running[0] += 1; peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock: running[0] -= 1
+
+        threads = [threading.Thread(target=scheduler.call, args=("test", slow)) for _ in range(12)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        self.assertEqual((peak[0], scheduler.stats()["inflight"]), (3, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
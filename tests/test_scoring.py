@@ -0,0 +1,77 @@
+import json
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from interview_core import CATEGORIES, TIMEOUT_ANSWER
+from scoring import AnswerScorer
+
+
+class Model:
+    # Puanlama isteğine sabit JSON, özet isteğine karar döndürür. fail_first: ilk n puanlama hata verir;
+    # hold: puanlamalar bu olay set edilene kadar bekler
+    def __init__(self, value=70, fail_first=0, hold=None):
+        self.value = value
+        self.fail_first = fail_first
+        self.hold = hold
+        self.scoring_calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        if prompt.startswith("MÜLAKAT ÖZETİ"):
+            return SimpleNamespace(text=json.dumps({"KARAR": "Olumlu", "RAPOR": "Özet"}))
+        with self._lock:
+            self.scoring_calls += 1
+            fail = self.scoring_calls <= self.fail_first
+        if self.hold is not None: self.hold.wait()
+        if fail: raise RuntimeError("geçici hata")
+        return SimpleNamespace(text=json.dumps({cat: self.value for cat in CATEGORIES} | {"not": "gözlem"}))
+
+
+class AnswerScorerTest(unittest.TestCase):
+    def test_report_aggregates_answers(self):
+        scorer = AnswerScorer(Model(80))
+        for i in range(3): scorer.submit(f"Soru {i}", f"Cevap {i}")
+        report = scorer.finish(timeout=5)
+        self.assertEqual((report["score"], report["values"], report["scored"], report["failed"]), (80, [80] * 5, 3, 0))
+        self.assertEqual(report["decision"], "Olumlu")
+
+    def test_timeout_answer_scores_zero_without_model_call(self):
+        model = Model(100)
+        scorer = AnswerScorer(model)
+        scorer.submit("Soru", "Cevap")
+        scorer.submit("Soru", TIMEOUT_ANSWER)
+        report = scorer.finish(timeout=5)
+        self.assertEqual((model.scoring_calls, report["values"]), (1, [50] * 5))
+
+    def test_failed_scoring_is_retried_at_finish(self):
+        model = Model(60, fail_first=2)
+        scorer = AnswerScorer(model)
+        for i in range(2): scorer.submit(f"Soru {i}", f"Cevap {i}")
+        report = scorer.finish(timeout=5)
+        self.assertEqual((report["scored"], report["failed"], report["score"]), (2, 0, 60))
+        self.assertEqual(scorer.failed, 2)
+
+    def test_unscored_answers_fail_at_deadline_instead_of_scoring_zero(self):
+        hold = threading.Event()
+        scorer = AnswerScorer(Model(hold=hold))
+        scorer.submit("Soru", "Cevap")
+        t0 = time.monotonic()
+        report = scorer.finish(timeout=0.2)
+        hold.set()
+        self.assertLess(time.monotonic() - t0, 2)
+        self.assertEqual((report["score"], report["decision"], report["failed"]), (None, "Değerlendirilemedi", 1))
+
+    def test_restored_unscored_answers_are_scored_at_finish(self):
+        scorer = AnswerScorer(Model(fail_first=1))
+        scorer.submit("Soru", "Cevap").result()
+        state = scorer.snapshot()
+        self.assertEqual(state["unscored"], [["Soru", "Cevap"]])
+        resumed = AnswerScorer(Model(90))
+        resumed.restore(json.loads(json.dumps(state)))
+        self.assertEqual(resumed.finish(timeout=5)["score"], 90)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from session_store import SessionStore, jd_key
+
+REPORT = {"score": 72, "decision": "Olumlu", "categories": list("ABCDE"), "values": [72] * 5, "text": "t", "missing": []}
+
+
+class SessionStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix="mulakat_store_")
+        self.store = SessionStore(os.path.join(self.dir, "s.sqlite3"), flush_interval=0.01)
+
+    def test_round_trip(self):
+        self.store.create("s1", "cv.pdf", "models/fake", "İlan", "sistem", [("cv.pdf", "metin")], secret="anahtar")
+        self.store.append_turns("s1", 0, [{"role": "assistant", "content": "Soru?"}, {"role": "user", "content": "Cevap"}])
+        self.store.save_state("s1", {"scorer": {"answers": 1}})
+        record = self.store.load("s1")
+        self.assertEqual([m["content"] for m in record["messages"]], ["Soru?", "Cevap"])
+        self.assertEqual((record["documents"], record["state"], record["report"]), ([("cv.pdf", "metin")], {"scorer": {"answers": 1}}, None))
+        self.assertNotIn("secret_hash", record)
+
+    def test_secret_is_required_to_reopen(self):
+        self.store.create("s1", "cv.pdf", "m", "İlan", "sistem", secret="anahtar")
+        self.store.create("batch", "cv.pdf", "m", "İlan", "sistem")
+        self.assertTrue(self.store.check_secret("s1", "anahtar"))
+        self.assertFalse(self.store.check_secret("s1", "yanlış"))
+        self.assertFalse(self.store.check_secret("s1", None))
+        self.assertFalse(self.store.check_secret("batch", ""))
+        self.assertFalse(self.store.check_secret("yok", "anahtar"))
+
+    def test_failed_write_is_reported(self):
+        self.store.create("s1", "cv.pdf", "m", "İlan", "sistem")
+        self.store._put("INSERT INTO olmayan_tablo VALUES (?)", (1,), "s1")
+        self.store.flush()
+        self.assertTrue(self.store.write_failed("s1"))
+        self.assertEqual(self.store.stats()["errors"], 1)
+
+    def test_summary_skips_unscored_reports(self):
+        for sid, score in (("a", 80), ("b", 40), ("c", None)):
+            self.store.create(sid, f"{sid}.pdf", "m", "İlan", "sistem")
+            self.store.finish(sid, dict(REPORT, score=score))
+        self.store.flush()
+        summary = self.store.summary(jd_key("İlan"), 60)
+        self.assertEqual((summary["count"], summary["avg_score"], summary["percentile"]), (2, 60, 0.5))
+
+    def test_migrates_old_database(self):
+        path = os.path.join(self.dir, "eski.sqlite3")
+        conn = sqlite3.connect(path)
+        conn.executescript("CREATE TABLE sessions (id TEXT PRIMARY KEY, candidate TEXT, model TEXT, jd_hash TEXT, "
+                           "job_description TEXT, system_prompt TEXT, documents TEXT, state TEXT, created_at REAL, "
+                           "updated_at REAL, finished_at REAL, score INTEGER, decision TEXT, report TEXT);"
+                           "INSERT INTO sessions (id, finished_at, report) VALUES ('eski', 1.0, '{}');")
+        conn.commit()
+        conn.close()
+        store = SessionStore(path)
+        self.assertEqual(store.load("eski")["report"], {})
+        self.assertFalse(store.check_secret("eski", "anahtar"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from tts import StubSynthesizer, TTSEngine, split_sentences
+
+
+class BrokenSynthesizer(StubSynthesizer):
+    name = "stub_broken"
+
+    def __call__(self, text): raise OSError("ağ yok")
+
+
+class SpeechJobTest(unittest.TestCase):
+    def setUp(self):
+        self.text = " ".join(f"Cümle {i} hakkında bir soru soruyorum." for i in range(12))
+        self.expected = b"".join(b"STUB:" + s.encode("utf-8") + b"\n" for s in split_sentences(self.text))
+
+    def stream(self, engine):
+        job = engine.job()
+        for end in range(0, len(self.text) + 1, 17): job.feed(self.text[:end])
+        return job.finish(self.text)
+
+    def test_split_sentences_drops_markdown_and_empty_parts(self):
+        self.assertEqual(split_sentences("Merhaba. **Nasılsın?**\n\n- ..."), ["Merhaba.", "Nasılsın?"])
+
+    def test_fed_sentences_join_in_order(self):
+        engine = TTSEngine(StubSynthesizer(delay=0.001), max_workers=3)
+        self.assertEqual(self.stream(engine).audio_bytes(), self.expected)
+
+    def test_repeated_reply_comes_from_cache(self):
+        stub = StubSynthesizer()
+        engine = TTSEngine(stub, max_workers=3)
+        self.stream(engine).audio_bytes()
+        calls = stub.calls
+        self.assertEqual(self.stream(engine).audio_bytes(), self.expected)
+        self.assertEqual(stub.calls, calls)
+
+    def test_failed_sentences_are_counted(self):
+        job = TTSEngine(BrokenSynthesizer()).job().finish("Birinci cümle. İkinci cümle.")
+        self.assertEqual(job.audio_bytes(), b"")
+        self.assertEqual(job.failed, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
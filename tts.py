@@ -0,0 +1,124 @@
+import io
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from disk_cache import DiskCache, content_hash
+
+# --- Metinden Sese (TTS) ---
+# Yanıt cümlelere bölünür, her cümle arka plandaki iş havuzunda ayrı ayrı seslendirilir.
+# Açılış cümleleri ve standart sorular çok tekrarlandığı için ses, cümle hash'i ile diskte (LRU) saklanır.
+_SENTENCE_END = re.compile(r"(?<=[.!?…:])\s+|\n\s*\n")
+_MARKDOWN = re.compile(r"[*_#`>]+")
+log = logging.getLogger(__name__)
+
+
+def split_sentences(text):
+    parts = (_MARKDOWN.sub("", p).strip() for p in _SENTENCE_END.split(text))
+    return [p for p in parts if re.search(r"\w", p)]
+
+
+class GTTSSynthesizer:
+    name = "gtts"
+
+    def __init__(self, lang="tr"):
+        self.lang = lang
+
+    def __call__(self, text):
+        from gtts import gTTS
+        buf = io.BytesIO()
+        gTTS(text=text, lang=self.lang).write_to_fp(buf)
+        return buf.getvalue()
+
+
+class StubSynthesizer:
+    # Ağ gerektirmeyen sahte seslendirici; boru hattını çevrimdışı denemek için
+    name = "stub"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        if self.delay: time.sleep(self.delay)
+        return b"STUB:" + text.encode("utf-8") + b"\n"
+
+
+class SpeechJob:
+    # Tek bir yanıtın seslendirmesi. feed() akış sırasında tamamlanan cümleleri hemen kuyruğa atar.
+    def __init__(self, engine):
+        self._engine = engine
+        self._futures = []
+        self._consumed = 0
+        self.failed = 0
+
+    def _submit(self, text):
+        for sentence in split_sentences(text):
+            self._futures.append(self._engine.submit(sentence))
+
+    def feed(self, text):
+        boundary = None
+        for m in _SENTENCE_END.finditer(text, self._consumed): boundary = m.end()
+        if boundary:
+            self._submit(text[self._consumed:boundary])
+            self._consumed = boundary
+        return self
+
+    def finish(self, text):
+        self._submit(text[self._consumed:])
+        self._consumed = len(text)
+        return self
+
+    def iter_ready(self):
+        # Cümleler sırayla, hazır oldukça döner; ilk cümle çalınırken sonrakiler üretilmeye devam eder.
+        # Seslendirilemeyen cümleler atlanır ve failed'da sayılır (arayüz uyarı gösterir).
+        for future in self._futures:
+            audio = future.result()
+            if audio: yield audio
+            else: self.failed += 1
+
+    def audio_bytes(self):
+        return b"".join(self.iter_ready())
+
+
+class TTSEngine:
+    def __init__(self, synthesizer=None, max_workers=3, cache_bytes=64 * 1024 * 1024):
+        self.synthesizer = synthesizer or GTTSSynthesizer()
+        self.cache = DiskCache(f"tts_{self.synthesizer.name}", max_bytes=cache_bytes, suffix=".mp3")
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts")
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _synthesize(self, key, sentence):
+        t0 = time.perf_counter()
+        try:
+            audio = self.cache.get(key)
+            cache = "hit" if audio is not None else "miss"
+            if audio is None:
+                audio = self.synthesizer(sentence)
+                self.cache.put(key, audio)
+            metrics.observe("tts_synth_seconds", time.perf_counter() - t0, cache=cache)
+            return audio
+        except Exception as e:
+            metrics.inc("tts_failures_total", error=type(e).__name__)
+            log.warning("TTS cümlesi seslendirilemedi: %s: %s", type(e).__name__, e)
+            return None
+        finally:
+            with self._lock: self._inflight.pop(key, None)
+
+    def submit(self, sentence):
+        key = content_hash(f"{getattr(self.synthesizer, 'lang', '')}|{sentence}")
+        with self._lock:
+            # Aynı cümle başka bir oturumda zaten üretiliyorsa o işe katıl
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._pool.submit(self._synthesize, key, sentence)
+                self._inflight[key] = future
+        return future
+
+    def job(self):
+        return SpeechJob(self)